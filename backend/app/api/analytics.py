@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, Request
 from typing import List, Dict
 from app.core.security import require_pro_user
 from app.services import analytics_service
@@ -15,11 +15,4 @@ async def get_patient_growth(
     """
     Get patient growth analytics data. This is a PRO feature.
     """
-    try:
-        growth_data = await analytics_service.get_patient_growth_analytics(current_user_id)
-        return growth_data
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while fetching analytics data."
-        )
\ No newline at end of file
+    return await analytics_service.get_patient_growth_analytics(current_user_id)
\ No newline at end of file
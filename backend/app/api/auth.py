@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from app.schemas.user import UserCreate, UserLogin
+from app.schemas.role import UserRole
 from app.core.limiter import limiter
 from app.schemas.token import Token, RefreshToken
 from app.services import user_service
-from app.core.security import create_access_token, create_refresh_token, get_current_user
+from app.core.security import create_access_token, create_refresh_token, get_current_user, require_role, revoke_user_tokens, ensure_not_revoked
+from app.core import jwt_backend
+from app.core.config import settings
 import jwt
 import logging
-from app.core.config import settings
 
 router = APIRouter()
 
@@ -32,13 +34,6 @@ async def register_user(request: Request, user_data: UserCreate):
     except ValueError as e:
         # This is for known errors, like "email already registered"
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        # This is for unexpected errors
-        logging.error(f"Unhandled exception during user registration: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred during registration."
-        )
 
 @router.post("/login", response_model=dict)
 @limiter.limit("5/minute")
@@ -72,9 +67,8 @@ async def refresh_access_token(request: Request, refresh_token_data: RefreshToke
     Refresh an access token using a valid refresh token.
     """
     try:
-        payload = jwt.decode(
-            refresh_token_data.refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = jwt_backend.decode(refresh_token_data.refresh_token)
+        await ensure_not_revoked(payload)
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(
@@ -82,11 +76,11 @@ async def refresh_access_token(request: Request, refresh_token_data: RefreshToke
                 detail="Invalid refresh token",
             )
 
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
+        claims = await user_service.get_user_token_claims(user_id)
+        if claims is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        access_token = create_access_token(subject=user.id, plan=user.plan, role=user.role)
+        access_token = create_access_token(subject=user_id, plan=claims["plan"], role=claims["role"])
 
         return {
             "access_token": access_token,
@@ -113,4 +107,19 @@ async def read_users_me(current_user_id: str = Depends(get_current_user)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return {"success": True, "user": user.to_response()}
\ No newline at end of file
+    return {"success": True, "user": user.to_response()}
+
+@router.post("/revoke/{user_id}", response_model=dict)
+async def revoke_tokens(user_id: str, admin_user_id: str = Depends(require_role(UserRole.ADMIN))):
+    """
+    Revoke all tokens issued to a user. This is an ADMIN feature.
+    Requires REDIS_URL so the revocation reaches every worker.
+    """
+    if not settings.REDIS_URL:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token revocation requires a shared cache (REDIS_URL)."
+        )
+    await revoke_user_tokens(user_id)
+    logging.info(f"Tokens for user {user_id} revoked by admin {admin_user_id}")
+    return {"success": True, "message": "Tokens revoked"}
\ No newline at end of file
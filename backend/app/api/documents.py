@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from typing import List
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List
+import orjson
 from app.core.security import require_pro_user
 from app.services import document_service
 from app.schemas.document import DocumentCreate, Document
@@ -7,6 +9,25 @@ from app.core.limiter import limiter
 
 router = APIRouter()
 
+_STREAM_CHUNK_SIZE = 100
+
+async def _json_array_chunks(records: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """
+    Encodes records as a single JSON array, flushing every _STREAM_CHUNK_SIZE items.
+    """
+    chunk = [b"["]
+    count = 0
+    async for record in records:
+        if count:
+            chunk.append(b",")
+        chunk.append(orjson.dumps(record))
+        count += 1
+        if count % _STREAM_CHUNK_SIZE == 0:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(b"]")
+    yield b"".join(chunk)
+
 @router.post("/", response_model=Document, status_code=status.HTTP_201_CREATED)
 @limiter.limit("10/minute")
 async def upload_document(
@@ -17,16 +38,15 @@ async def upload_document(
     """
     Create a new document record. This is a PRO feature.
     """
-    try:
-        document = await document_service.create_document(doc_data, current_user_id)
-        return document
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while creating the document record."
-        )
+    return await document_service.create_document(doc_data, current_user_id)
 
-@router.get("/{patient_id}", response_model=List[Document])
+# The body is streamed rather than validated against a response_model; the
+# projection in document_service keeps it to the Document fields.
+@router.get(
+    "/{patient_id}",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[Document], "content": {"application/json": {}}}}
+)
 @limiter.limit("30/minute")
 async def get_patient_documents(
     request: Request,
@@ -35,12 +55,7 @@ async def get_patient_documents(
 ):
     """
     Get all documents for a specific patient. This is a PRO feature.
+    The list is streamed from the database cursor as a JSON array.
     """
-    try:
-        documents = await document_service.get_documents_for_patient(patient_id, current_user_id)
-        return documents
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while fetching documents."
-        )
\ No newline at end of file
+    documents = document_service.iter_documents_for_patient(patient_id, current_user_id)
+    return StreamingResponse(_json_array_chunks(documents), media_type="application/json")
\ No newline at end of file
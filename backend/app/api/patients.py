@@ -4,15 +4,11 @@ from app.core.security import get_current_user, require_pro_user, require_role
 from app.schemas.role import UserRole
 from app.services import patient_service, clinical_note_service
 from app.core.limiter import limiter
-from app.schemas.patient import (
-    PatientCreate, PatientUpdate, Patient
-)
+from app.schemas.patient import PatientCreate, PatientUpdate
 from app.schemas.clinical_note import NoteCreate, ClinicalNote
 
 router = APIRouter()
 
-import logging
-
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 @limiter.limit("20/minute")
 async def create_patient(
@@ -23,15 +19,28 @@ async def create_patient(
     """
     Create a new patient record. (Doctor-only)
     """
-    try:
-        patient = await patient_service.create_patient(patient_data, current_user_id)
-        return {"success": True, "patient": patient}
-    except Exception as e:
-        logging.error(f"Error creating patient for user {current_user_id}: {e}", exc_info=True)
+    patient = await patient_service.create_patient(patient_data, current_user_id)
+    return {"success": True, "patient": patient}
+
+@router.post("/bulk", response_model=dict, status_code=status.HTTP_201_CREATED)
+@limiter.limit("5/minute")
+async def create_patients(
+    request: Request,
+    patients_data: List[PatientCreate],
+    current_user_id: str = Depends(require_role(UserRole.DOCTOR))
+):
+    """
+    Create several patient records in one request. (Doctor-only)
+    """
+    if not patients_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No patients provided")
+    if len(patients_data) > patient_service.PATIENT_BULK_MAX:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while creating the patient."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {patient_service.PATIENT_BULK_MAX} patients can be created at once"
         )
+    patients = await patient_service.create_patients(patients_data, current_user_id)
+    return {"success": True, "patients": patients}
 
 @router.get("/", response_model=dict)
 @limiter.limit("60/minute")
@@ -40,37 +49,43 @@ async def get_all_patients(
     search: Optional[str] = None,
     group: Optional[str] = None,
     favorites_only: bool = False,
+    limit: int = Query(default=patient_service.PATIENT_PAGE_SIZE, ge=1, le=1000),
+    cursor: Optional[str] = None,
     current_user_id: str = Depends(get_current_user)
 ):
     """
-    Retrieve all patients for the current user, with optional filters.
+    Retrieve a page of patients for the current user, with optional filters.
+    Pass the returned `next_cursor` as `cursor` to fetch the following page.
     """
     try:
-        patients = await patient_service.get_patients_by_user_id(
-            user_id=current_user_id,
-            search=search,
-            group=group,
-            favorites_only=favorites_only
-        )
-        return {"success": True, "patients": patients}
-    except Exception as e:
-        logging.error(f"Error fetching patients for user {current_user_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while fetching patients."
-        )
+        before = patient_service.decode_patient_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    patients = await patient_service.get_patients_by_user_id(
+        user_id=current_user_id,
+        search=search,
+        group=group,
+        favorites_only=favorites_only,
+        limit=limit,
+        before=before
+    )
+    # Search results are ranked rather than paged, so they have no cursor.
+    next_cursor = patient_service.encode_patient_cursor(patients[-1]) if len(patients) == limit and not search else None
+    return {"success": True, "patients": patients, "next_cursor": next_cursor}
 
 @router.get("/{id}", response_model=dict)
 @limiter.limit("120/minute")
 async def get_patient_by_id(
     request: Request,
     id: str,
+    include_photo: bool = True,
     current_user_id: str = Depends(get_current_user)
 ):
     """
     Retrieve a single patient by their unique ID.
+    Pass `include_photo=false` to leave out the base64 photo.
     """
-    patient = await patient_service.get_patient_by_id(id, current_user_id)
+    patient = await patient_service.get_patient_by_id(id, current_user_id, include_photo)
     if not patient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
     return {"success": True, "patient": patient}
@@ -129,12 +144,14 @@ async def add_patient_note(
 async def get_patient_notes(
     request: Request,
     id: str,
+    limit: int = Query(default=0, ge=0, le=1000),
     current_user_id: str = Depends(get_current_user)
 ):
     """
-    Get all notes for a specific patient.
+    Get the notes for a specific patient, newest first.
+    Pass `limit` to return only the most recent ones; 0 (the default) returns all.
     """
-    notes = await patient_service.get_patient_notes(id, current_user_id)
+    notes = await patient_service.get_patient_notes(id, current_user_id, limit)
     if notes is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
     return {"success": True, "notes": notes}
@@ -147,15 +164,8 @@ async def get_patient_groups(request: Request, current_user_id: str = Depends(ge
     """
     Get a list of unique patient groups for the user.
     """
-    try:
-        groups = await patient_service.get_patient_groups(current_user_id)
-        return {"success": True, "groups": groups}
-    except Exception as e:
-        logging.error(f"Error fetching groups for user {current_user_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while fetching groups."
-        )
+    groups = await patient_service.get_patient_groups(current_user_id)
+    return {"success": True, "groups": groups}
 
 @router.get("/stats/", response_model=dict)
 @limiter.limit("30/minute")
@@ -163,15 +173,8 @@ async def get_statistics(request: Request, current_user_id: str = Depends(get_cu
     """
     Get user-specific statistics (total patients, favorites, etc.).
     """
-    try:
-        stats = await patient_service.get_user_stats(current_user_id)
-        return {"success": True, "stats": stats}
-    except Exception as e:
-        logging.error(f"Error fetching stats for user {current_user_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while fetching statistics."
-        )
+    stats = await patient_service.get_user_stats(current_user_id)
+    return {"success": True, "stats": stats}
 
 # --- Pro-Only Endpoint Example ---
 
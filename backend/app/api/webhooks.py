@@ -1,18 +1,59 @@
-from fastapi import APIRouter, Request, Response, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from app.core.config import settings
+import hashlib
+import hmac
 import logging
+import time
 
 router = APIRouter()
 
+def _verify_stripe_signature(payload: bytes, signature_header: str, secret: str):
+    """
+    Checks a Stripe-Signature header (`t=<timestamp>,v1=<signature>,...`) against the raw payload.
+    Raises ValueError if the header is malformed, too old, or no v1 signature matches.
+    """
+    timestamp = None
+    signatures = []
+    for item in signature_header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+
+    if not timestamp or not signatures:
+        raise ValueError("Malformed signature header")
+    try:
+        signed_at = int(timestamp)
+    except ValueError:
+        raise ValueError("Malformed signature timestamp")
+    if abs(time.time() - signed_at) > settings.STRIPE_WEBHOOK_TOLERANCE:
+        raise ValueError("Signature timestamp outside the tolerance window")
+
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + payload, hashlib.sha256).hexdigest()
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        raise ValueError("No matching signature")
+
 @router.post("/stripe", status_code=status.HTTP_200_OK)
 async def stripe_webhook(request: Request):
     """
-    Basic webhook endpoint for Stripe.
-    In a real application, this would handle events from Stripe.
+    Webhook endpoint for Stripe.
+    Verifies the Stripe-Signature header before accepting the event.
     """
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        logging.error("Stripe webhook received but STRIPE_WEBHOOK_SECRET is not configured.")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook not configured")
+
     payload = await request.body()
-    # For now, we'll just log the payload and headers.
-    # In a real app, you would verify the signature and process the event.
-    logging.info(f"Received Stripe webhook with headers: {request.headers}")
-    logging.info(f"Webhook payload: {payload.decode('utf-8')}")
+    # Log a short fingerprint instead of the body, which may be large and contain customer data.
+    payload_digest = hashlib.sha256(payload).hexdigest()[:12]
+
+    try:
+        _verify_stripe_signature(payload, request.headers.get("stripe-signature", ""), settings.STRIPE_WEBHOOK_SECRET)
+    except ValueError as e:
+        logging.warning(f"Rejected Stripe webhook {payload_digest} ({len(payload)} bytes): {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid signature")
+
+    logging.info(f"Received Stripe webhook {payload_digest} ({len(payload)} bytes)")
 
-    return Response(status_code=status.HTTP_200_OK)
\ No newline at end of file
+    return Response(status_code=status.HTTP_200_OK)
@@ -0,0 +1,164 @@
+import functools
+import logging
+from typing import Any, Callable, Optional
+
+import orjson
+from cachetools import TLRUCache
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class _MemoryBackend:
+    """
+    Per-process fallback used when REDIS_URL is not configured.
+    Entries expire individually according to the TTL they were stored with.
+    """
+    def __init__(self, maxsize: int = 10_000):
+        self._entries = TLRUCache(maxsize=maxsize, ttu=lambda _key, value, now: now + value[0])
+        self._tags = TLRUCache(maxsize=maxsize, ttu=lambda _key, value, now: now + value[0])
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    async def set(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        self._entries[key] = (ttl, value)
+        if tag:
+            _, keys = self._tags.get(tag, (ttl, set()))
+            keys.add(key)
+            self._tags[tag] = (ttl, keys)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_tag(self, tag: str):
+        _, keys = self._tags.pop(tag, (0, set()))
+        await self.delete(*keys)
+
+    async def close(self):
+        self._entries.clear()
+        self._tags.clear()
+
+class _RedisBackend:
+    """
+    Shared cache backed by a pooled redis.asyncio client, so every worker
+    process sees the same entries and invalidations.
+    """
+    def __init__(self, url: str):
+        self._client = aioredis.from_url(url, max_connections=50)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl)
+            if tag:
+                # The tag is a set of member keys that outlives each of them.
+                pipe.sadd(tag, key)
+                pipe.expire(tag, ttl)
+            await pipe.execute()
+
+    async def delete(self, *keys: str):
+        await self._client.delete(*keys)
+
+    async def delete_tag(self, tag: str):
+        keys = await self._client.smembers(tag)
+        await self._client.delete(tag, *keys)
+
+    async def close(self):
+        await self._client.aclose()
+
+_backend = _RedisBackend(settings.REDIS_URL) if settings.REDIS_URL else _MemoryBackend()
+
+async def _safe_get(key: str) -> Optional[bytes]:
+    try:
+        return await _backend.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+async def _safe_set(key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+    try:
+        await _backend.set(key, value, ttl, tag)
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+async def get_value(key: str) -> Optional[bytes]:
+    """
+    Returns the raw bytes stored under a key, or None if it is missing or the cache is unavailable.
+    """
+    return await _safe_get(key)
+
+async def set_value(key: str, value: bytes, ttl: int):
+    """
+    Stores raw bytes under a key for `ttl` seconds.
+    """
+    await _safe_set(key, value, ttl)
+
+async def invalidate(*keys: str):
+    """
+    Removes the given keys from the cache.
+    """
+    try:
+        await _backend.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {e}")
+
+async def invalidate_tag(tag: str):
+    """
+    Removes every key that was stored under the given tag.
+    """
+    try:
+        await _backend.delete_tag(tag)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for tag {tag}: {e}")
+
+def redis_memoize(
+    ttl: int,
+    key: Callable[..., str],
+    tag: Optional[Callable[..., str]] = None,
+    dumps: Callable[[Any], bytes] = orjson.dumps,
+    loads: Callable[[bytes], Any] = orjson.loads,
+):
+    """
+    Caches an async function's result under `key(*args, **kwargs)` for `ttl` seconds.
+    Results are stored serialized with `dumps` and rebuilt with `loads` on a hit.
+    The wrapped function gains an `invalidate(*args, **kwargs)` coroutine that drops
+    the entry for the given arguments. If `tag` is given, every entry is also
+    grouped under `tag(*args, **kwargs)` and `invalidate_tag(*args, **kwargs)`
+    drops the whole group. Cache errors never fail the call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            cached = await _safe_get(cache_key)
+            if cached is not None:
+                return loads(cached)
+
+            result = await func(*args, **kwargs)
+            await _safe_set(cache_key, dumps(result), ttl, tag(*args, **kwargs) if tag else None)
+            return result
+
+        async def invalidate_entry(*args, **kwargs):
+            await invalidate(key(*args, **kwargs))
+
+        async def invalidate_group(*args, **kwargs):
+            await invalidate_tag(tag(*args, **kwargs))
+
+        wrapper.invalidate = invalidate_entry
+        if tag:
+            wrapper.invalidate_tag = invalidate_group
+        return wrapper
+    return decorator
+
+async def close_cache():
+    """
+    Closes the cache backend. This should be called during application shutdown.
+    """
+    await _backend.close()
@@ -15,10 +15,35 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 # --- Database Settings ---
 MONGO_URL = os.getenv("MONGO_URL")
 DB_NAME = os.getenv("DB_NAME")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "200"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "20"))
+# Wire compression, negotiated with the server in order of preference.
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+# Server-side time budget (maxTimeMS) for list, search and aggregation queries.
+MONGO_QUERY_TIMEOUT_MS = int(os.getenv("MONGO_QUERY_TIMEOUT_MS", "3000"))
+# Fail requests quickly when no server is reachable instead of waiting the driver's default 30 s.
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000"))
+
+# --- Cache Settings ---
+# When unset, cached results are kept in-process instead of in Redis.
+REDIS_URL = os.getenv("REDIS_URL")
+
+# --- Stripe Settings ---
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+# Maximum age, in seconds, of a webhook signature timestamp.
+STRIPE_WEBHOOK_TOLERANCE = 300
 
 # --- CORS Settings ---
 # In a production environment, you should restrict this to your frontend's domain
-ALLOWED_ORIGINS = ["*"]
+# with a comma-separated ALLOWED_ORIGINS.
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",") if origin.strip()]
+# Everything the API's routes and its bearer-token clients actually use.
+ALLOWED_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+ALLOWED_HEADERS = ["Authorization", "Content-Type"]
+
+# --- Response Compression ---
+# Bodies smaller than this many bytes are sent uncompressed; gzip would not pay for itself.
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
 
 class Settings:
     SECRET_KEY: str = SECRET_KEY
@@ -27,6 +52,17 @@ class Settings:
     REFRESH_TOKEN_EXPIRE_DAYS: int = REFRESH_TOKEN_EXPIRE_DAYS
     MONGO_URL: str = MONGO_URL
     DB_NAME: str = DB_NAME
+    MONGO_MAX_POOL_SIZE: int = MONGO_MAX_POOL_SIZE
+    MONGO_MIN_POOL_SIZE: int = MONGO_MIN_POOL_SIZE
+    MONGO_COMPRESSORS: str = MONGO_COMPRESSORS
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = MONGO_SERVER_SELECTION_TIMEOUT_MS
+    MONGO_QUERY_TIMEOUT_MS: int = MONGO_QUERY_TIMEOUT_MS
+    REDIS_URL: str | None = REDIS_URL
+    STRIPE_WEBHOOK_SECRET: str | None = STRIPE_WEBHOOK_SECRET
+    STRIPE_WEBHOOK_TOLERANCE: int = STRIPE_WEBHOOK_TOLERANCE
     ALLOWED_ORIGINS: list[str] = ALLOWED_ORIGINS
+    ALLOWED_METHODS: list[str] = ALLOWED_METHODS
+    ALLOWED_HEADERS: list[str] = ALLOWED_HEADERS
+    GZIP_MINIMUM_SIZE: int = GZIP_MINIMUM_SIZE
 
 settings = Settings()
\ No newline at end of file
@@ -1,11 +1,35 @@
-from passlib.context import CryptContext
+import bcrypt
+from app.core.kdf_pool import run_in_pool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes are created as "$2b$<rounds>$<salt and digest>"; older idents or a
+# lower cost mark a stored hash for upgrade on the next successful login.
+BCRYPT_IDENT = "2b"
+BCRYPT_ROUNDS = 12
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password:
+        return False
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed or non-bcrypt hash
+        return False
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Returns True if a stored hash uses outdated parameters and should be replaced."""
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or parts[1] != BCRYPT_IDENT or not parts[2].isdigit():
+        return True
+    return int(parts[2]) < BCRYPT_ROUNDS
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password in the KDF process pool without blocking the event loop."""
+    return await run_in_pool(_check_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes a password in the KDF process pool without blocking the event loop."""
+    return await run_in_pool(get_password_hash, password)
@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+@lru_cache(maxsize=None)
+def _field_names(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+def hydrate(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Builds a model instance from a trusted database document without validation.
+    Complete documents are assigned straight into the instance __dict__; documents
+    missing any field go through model_construct so defaults are applied.
+    """
+    fields = _field_names(model)
+    values = {name: data[name] for name in fields if name in data}
+    if len(values) != len(fields):
+        return model.model_construct(**data)
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
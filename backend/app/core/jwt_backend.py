@@ -0,0 +1,48 @@
+import hmac
+import time
+import orjson
+from jwt.algorithms import get_default_algorithms
+from jwt.api_jws import PyJWS
+from jwt.exceptions import DecodeError, ExpiredSignatureError
+from jwt.utils import base64url_encode
+
+from app.core.config import settings
+
+# --- Prepared Signing Material ---
+# The algorithm object and key are resolved once at import so encoding and
+# decoding only do the per-token work (JSON + HMAC).
+_ALGORITHM = get_default_algorithms()[settings.ALGORITHM]
+_KEY = _ALGORITHM.prepare_key(settings.SECRET_KEY)
+_jws = PyJWS(algorithms=[settings.ALGORITHM])
+
+# The header never changes, so its base64url segment is encoded once.
+_HEADER_SEGMENT = base64url_encode(orjson.dumps({"alg": settings.ALGORITHM, "typ": "JWT"}))
+
+def encode(payload: dict) -> str:
+    """
+    Signs a payload and returns the compact JWT string.
+    Time-based claims (exp, iat) must already be epoch seconds.
+    """
+    signing_input = _HEADER_SEGMENT + b"." + base64url_encode(orjson.dumps(payload))
+    signature = hmac.new(_KEY, signing_input, _ALGORITHM.hash_alg).digest()
+    return (signing_input + b"." + base64url_encode(signature)).decode()
+
+def decode(token: str) -> dict:
+    """
+    Verifies a token's signature and expiry and returns its payload.
+    Raises jwt.ExpiredSignatureError or jwt.DecodeError like jwt.decode does.
+    """
+    try:
+        payload = orjson.loads(_jws.decode(token, _KEY, algorithms=[settings.ALGORITHM]))
+    except orjson.JSONDecodeError as e:
+        raise DecodeError(f"Invalid payload string: {e}") from e
+    if not isinstance(payload, dict):
+        raise DecodeError("Invalid payload string: must be a json object")
+
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise DecodeError("Expiration Time claim (exp) must be an integer.")
+        if exp <= time.time():
+            raise ExpiredSignatureError("Signature has expired")
+    return payload
@@ -0,0 +1,27 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Key Derivation Pool ---
+# Password hashing is deliberately CPU-heavy (~100 ms per bcrypt call). Running
+# it in worker processes keeps the event loop responsive and lets concurrent
+# logins use every core. Workers are spawned rather than forked so they never
+# inherit the parent's driver threads or locks.
+_POOL = ProcessPoolExecutor(
+    max_workers=os.cpu_count(),
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+async def run_in_pool(func, *args):
+    """
+    Runs a picklable, module-level function in the KDF pool and awaits the result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, func, *args)
+
+def shutdown_pool():
+    """
+    Stops the worker processes. This should be called during application shutdown.
+    """
+    _POOL.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,14 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from app.core.config import settings
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+# Counters live in Redis when it is configured so limits hold across workers;
+# otherwise they fall back to per-process memory.
+if settings.REDIS_URL:
+    limiter = Limiter(
+        key_func=get_remote_address,
+        storage_uri=settings.REDIS_URL,
+        storage_options={"max_connections": 50}
+    )
+else:
+    limiter = Limiter(key_func=get_remote_address, storage_uri="memory://")
@@ -1,13 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional, List
+from cachetools import TTLCache
+import time
 import jwt
 
 from app.core.config import settings
+from app.core import cache, jwt_backend
 from app.schemas.user import UserPlan
 from app.schemas.role import UserRole
-from app.core.hashing import verify_password
+from app.core.hashing import verify_password_async
 from app.services import user_service
 from app.models.user import User
 
@@ -15,37 +18,90 @@ from app.models.user import User
 # We instantiate it once and reuse it in our dependency
 reusable_oauth2 = HTTPBearer()
 
+# --- Decoded Token Cache ---
+# Maps a raw token string to its verified payload so repeated requests with the
+# same bearer token skip signature verification. Entries live for at most 15
+# seconds and are never served past the token's own expiry.
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=15)
+
 async def authenticate_user(email: str, password: str) -> User | None:
     user = await user_service.get_user_by_email(email=email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
 
 # --- JWT Token Creation ---
 def create_access_token(subject: str, plan: str, role: str, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a new access token with plan and role."""
+    issued_at = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(issued_at + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = issued_at + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-    to_encode = {"exp": expire, "sub": str(subject), "plan": plan, "role": role}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode = {"exp": expire, "iat": issued_at, "sub": str(subject), "plan": plan, "role": role}
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a new refresh token."""
+    issued_at = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(issued_at + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = issued_at + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode = {"exp": expire, "iat": issued_at, "sub": str(subject)}
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
+def _decode_token(token: str) -> dict:
+    """
+    Decodes and verifies a JWT, reusing a recent verification of the same token.
+    Raises jwt.PyJWTError (or a subclass) if the token is invalid or expired.
+    """
+    payload = _TOKEN_CACHE.get(token)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+
+    payload = jwt_backend.decode(token)
+    if "exp" in payload:
+        _TOKEN_CACHE[token] = payload
+    return payload
+
+# --- Token Revocation ---
+# Revoking a user stores the revocation time in the shared cache for as long as
+# any refresh token could still be valid; tokens issued before it are rejected.
+# Both sides are whole seconds, like the JWT `iat` claim, so a token issued right
+# after the revocation (e.g. by logging in again) is accepted. Tokens issued
+# earlier in that same second also survive.
+# Every authenticated request reads this key, so it costs one cache GET per request.
+# Revocations are only visible to all workers when REDIS_URL is set; the
+# in-process fallback would keep them inside a single worker.
+def _revocation_key(user_id: str) -> str:
+    return f"revoked:{user_id}"
+
+async def revoke_user_tokens(user_id: str):
+    """Revokes every access and refresh token issued to the user so far."""
+    ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    await cache.set_value(_revocation_key(user_id), str(int(time.time())).encode(), ttl)
+
+async def ensure_not_revoked(payload: dict):
+    """
+    Raises jwt.InvalidTokenError if the token was issued before its user's tokens were revoked.
+    """
+    revoked_at = await cache.get_value(_revocation_key(payload.get("sub", "")))
+    # Older entries were stored with sub-second precision.
+    if revoked_at is not None and payload.get("iat", 0) < int(float(revoked_at)):
+        raise jwt.InvalidTokenError("Token has been revoked")
+
+async def _verify_token(token: str) -> dict:
+    payload = _decode_token(token)
+    await ensure_not_revoked(payload)
+    return payload
+
 # --- Dependency to Get Current User ---
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(reusable_oauth2)) -> str:
     """
@@ -53,9 +109,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(r
     Raises HTTPException for invalid credentials.
     """
     try:
-        payload = jwt.decode(
-            credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = await _verify_token(credentials.credentials)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -76,11 +130,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(r
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred during authentication"
-        )
 
 # --- Dependency to Require "Pro" User ---
 async def require_pro_user(credentials: HTTPAuthorizationCredentials = Depends(reusable_oauth2)) -> str:
@@ -89,9 +138,7 @@ async def require_pro_user(credentials: HTTPAuthorizationCredentials = Depends(r
     Raises HTTPException if the user is not a pro user.
     """
     try:
-        payload = jwt.decode(
-            credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = await _verify_token(credentials.credentials)
         user_id: str = payload.get("sub")
         user_plan: str = payload.get("plan")
 
@@ -127,9 +174,7 @@ def require_role(required_role: UserRole):
         Checks if the user has the required role.
         """
         try:
-            payload = jwt.decode(
-                credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
+            payload = await _verify_token(credentials.credentials)
             user_id: str = payload.get("sub")
             user_role: str = payload.get("role")
 
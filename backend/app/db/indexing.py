@@ -1,10 +1,27 @@
 import logging
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
 from app.db.session import UserCollection, PatientCollection, ClinicalNoteCollection, DocumentCollection
 
 logger = logging.getLogger(__name__)
 
+# Patient list indexes replaced by versions ending in `id`, the list cursor's tie-breaker,
+# and user_ym, which growth analytics can't use since it also reads created_at.
+_SUPERSEDED_PATIENT_INDEXES = ("user_created_at_desc", "user_group", "user_fav", "user_ym")
+# No query lists documents by user and upload time.
+_SUPERSEDED_DOCUMENT_INDEXES = ("user_uploaded_at_desc",)
+
+async def _drop_indexes(collection, names):
+    """
+    Drops indexes that are no longer created, ignoring ones that are already gone.
+    """
+    for name in names:
+        try:
+            await collection.drop_index(name)
+        except OperationFailure:
+            pass  # Already dropped, or never created.
+
 async def create_indexes():
     """
     Creates all necessary indexes for the collections if they don't already exist.
@@ -22,14 +39,48 @@ async def create_indexes():
         await PatientCollection.create_indexes([
             IndexModel([("user_id", ASCENDING)], name="user_id_asc"),
             IndexModel([("id", ASCENDING)], name="id_asc", unique=True),
-            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at_desc")
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="user_created_at_id_desc"),
+            IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING)], name="user_updated_at_desc", background=True),
+            # List filters keep the (created_at, id) sort inside the index.
+            IndexModel(
+                [("user_id", ASCENDING), ("group", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+                name="user_group_created_at_id_desc",
+                background=True
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("is_favorite", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+                name="user_fav_created_at_id_desc",
+                background=True
+            ),
+            # Anchored prefix searches on each searchable field.
+            IndexModel([("user_id", ASCENDING), ("name_lower", ASCENDING)], name="user_name_lower", background=True),
+            IndexModel([("user_id", ASCENDING), ("patient_id", ASCENDING)], name="user_patient_id", background=True),
+            IndexModel([("user_id", ASCENDING), ("email_lower", ASCENDING)], name="user_email_lower", background=True),
+            IndexModel([("user_id", ASCENDING), ("phone_digits", ASCENDING)], name="user_phone_digits", background=True),
+            # Text search is always scoped to a single user, so user_id is the index prefix.
+            IndexModel(
+                [("user_id", ASCENDING), ("name", TEXT), ("patient_id", TEXT), ("phone", TEXT), ("email", TEXT)],
+                name="patient_text",
+                background=True
+            )
         ])
+        await _drop_indexes(PatientCollection, _SUPERSEDED_PATIENT_INDEXES)
         logger.info("Indexes for PatientCollection created successfully.")
 
         # ClinicalNote Collection Indexes
         await ClinicalNoteCollection.create_indexes([
             IndexModel([("patient_id", ASCENDING)], name="patient_id_asc"),
-            IndexModel([("user_id", ASCENDING)], name="user_id_asc")
+            IndexModel([("user_id", ASCENDING)], name="user_id_asc"),
+            # Sync push upserts and deletes notes by their id.
+            IndexModel([("id", ASCENDING)], name="id_asc", unique=True, background=True),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at_desc", background=True),
+            IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING)], name="user_updated_at_desc", background=True),
+            # Serves a patient's notes already sorted newest first.
+            IndexModel(
+                [("user_id", ASCENDING), ("patient_id", ASCENDING), ("created_at", DESCENDING)],
+                name="user_patient_created_at_desc",
+                background=True
+            )
         ])
         logger.info("Indexes for ClinicalNoteCollection created successfully.")
 
@@ -38,6 +89,7 @@ async def create_indexes():
             IndexModel([("patient_id", ASCENDING)], name="patient_id_asc"),
             IndexModel([("user_id", ASCENDING)], name="user_id_asc")
         ])
+        await _drop_indexes(DocumentCollection, _SUPERSEDED_DOCUMENT_INDEXES)
         logger.info("Indexes for DocumentCollection created successfully.")
 
         logger.info("All indexes have been processed.")
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from app.core.hashing import get_password_hash
 from app.db.session import UserCollection, PatientCollection, CounterCollection
 from app.schemas.user import UserPlan, SubscriptionStatus
-import uuid
+from app.core.ids import new_id
+from app.services.patient_service import set_search_fields, SEARCH_FIELDS
+from pymongo import UpdateOne
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -15,77 +17,86 @@ async def init_dummy_data():
     logger.info("Starting dummy data initialization...")
     try:
         # --- Create Demo Users ---
+        now = datetime.utcnow()
         demo_users = [
             {
                 "id": "demo_user_1", "email": "dr.sarah@clinic.com", "phone": "+1234567890",
                 "full_name": "Dr. Sarah Johnson", "medical_specialty": "cardiology",
-                "password_hash": get_password_hash("password123"), "plan": UserPlan.PRO,
-                "subscription_status": SubscriptionStatus.ACTIVE, "subscription_end_date": datetime.utcnow() + timedelta(days=365),
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "plan": UserPlan.PRO,
+                "subscription_status": SubscriptionStatus.ACTIVE, "subscription_end_date": now + timedelta(days=365),
+                "created_at": now, "updated_at": now
             },
             {
                 "id": "demo_user_2", "email": "dr.mike@physio.com", "phone": "+1987654321",
                 "full_name": "Dr. Mike Chen", "medical_specialty": "physiotherapy",
-                "password_hash": get_password_hash("password123"), "plan": UserPlan.BASIC,
-                "subscription_status": SubscriptionStatus.ACTIVE, "subscription_end_date": datetime.utcnow() + timedelta(days=30),
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "plan": UserPlan.BASIC,
+                "subscription_status": SubscriptionStatus.ACTIVE, "subscription_end_date": now + timedelta(days=30),
+                "created_at": now, "updated_at": now
             }
         ]
 
         logger.info("Checking and inserting demo users...")
-        for user_data in demo_users:
-            if not await UserCollection.find_one({"email": user_data["email"]}):
-                await UserCollection.insert_one(user_data)
-                logger.info(f"Inserted user: {user_data['email']}")
+        # One probe for all demo emails, and only hash passwords for users that are missing.
+        cursor = UserCollection.find({"email": {"$in": [user["email"] for user in demo_users]}}, {"_id": 0, "email": 1})
+        existing_emails = {user["email"] async for user in cursor}
+        missing_users = [user for user in demo_users if user["email"] not in existing_emails]
+        if missing_users:
+            password_hash = get_password_hash("password123")
+            for user_data in missing_users:
+                user_data["password_hash"] = password_hash
+            await UserCollection.insert_many(missing_users, ordered=False)
+            logger.info(f"Inserted users: {', '.join(user['email'] for user in missing_users)}")
 
         # --- Create Dummy Patients for Dr. Sarah (demo_user_1) ---
         user_id_sarah = "demo_user_1"
-        if await PatientCollection.count_documents({"user_id": user_id_sarah}) > 0:
+        if await PatientCollection.find_one({"user_id": user_id_sarah}, {"_id": 1}):
             logger.info(f"Patients for {user_id_sarah} already exist. Skipping creation.")
             return
 
         logger.info("Creating dummy patients for Dr. Sarah...")
         dummy_patients = [
             {
-                "id": str(uuid.uuid4()), "patient_id": "PAT001", "user_id": user_id_sarah, "name": "John Wilson",
+                "id": new_id(), "patient_id": "PAT001", "user_id": user_id_sarah, "name": "John Wilson",
                 "phone": "+1555123456", "email": "john.wilson@email.com", "address": "123 Main St, Springfield",
                 "location": "Clinic Room 1", "initial_complaint": "Chest pain", "initial_diagnosis": "Suspected angina", "photo": "",
                 "group": "cardiology", "is_favorite": True,
-                "notes": [{"id": str(uuid.uuid4()), "content": "Initial consultation.", "timestamp": datetime.utcnow(), "visit_type": "initial", "created_by": "Dr. Sarah Johnson"}],
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "notes": [{"id": new_id(), "content": "Initial consultation.", "timestamp": now, "visit_type": "initial", "created_by": "Dr. Sarah Johnson"}],
+                "created_at": now, "updated_at": now
             },
             {
-                "id": str(uuid.uuid4()), "patient_id": "PAT002", "user_id": user_id_sarah, "name": "Emma Rodriguez",
+                "id": new_id(), "patient_id": "PAT002", "user_id": user_id_sarah, "name": "Emma Rodriguez",
                 "phone": "+1555987654", "email": "emma.r@email.com", "address": "456 Oak Ave, Springfield",
                 "location": "Clinic Room 2", "initial_complaint": "High blood pressure review", "initial_diagnosis": "Hypertension", "photo": "",
                 "group": "cardiology", "is_favorite": False, "notes": [],
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "created_at": now, "updated_at": now
             },
             {
-                "id": str(uuid.uuid4()), "patient_id": "PAT003", "user_id": user_id_sarah, "name": "Robert Chang",
+                "id": new_id(), "patient_id": "PAT003", "user_id": user_id_sarah, "name": "Robert Chang",
                 "phone": "+1555456789", "email": "robert.chang@email.com", "address": "789 Pine St, Springfield",
                 "location": "Home Visit", "initial_complaint": "Diabetic foot care", "initial_diagnosis": "Diabetic neuropathy", "photo": "",
                 "group": "endocrinology", "is_favorite": False, "notes": [],
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "created_at": now, "updated_at": now
             },
             {
-                "id": str(uuid.uuid4()), "patient_id": "PAT004", "user_id": user_id_sarah, "name": "Lisa Thompson",
+                "id": new_id(), "patient_id": "PAT004", "user_id": user_id_sarah, "name": "Lisa Thompson",
                 "phone": "+1555654321", "email": "lisa.thompson@email.com", "address": "321 Elm Dr, Springfield",
                 "location": "Clinic Room 1", "initial_complaint": "Pregnancy cardiac monitoring", "initial_diagnosis": "Benign heart murmur", "photo": "",
                 "group": "obstetric_cardiology", "is_favorite": True, "notes": [],
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "created_at": now, "updated_at": now
             },
             {
-                "id": str(uuid.uuid4()), "patient_id": "PAT005", "user_id": user_id_sarah, "name": "David Miller",
+                "id": new_id(), "patient_id": "PAT005", "user_id": user_id_sarah, "name": "David Miller",
                 "phone": "+1555789012", "email": "david.miller@email.com", "address": "654 Maple Ave, Springfield",
                 "location": "Clinic Room 3", "initial_complaint": "Post-cardiac surgery follow-up", "initial_diagnosis": "Post-operative recovery", "photo": "",
                 "group": "post_surgical", "is_favorite": False, "notes": [],
-                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()
+                "created_at": now, "updated_at": now
             }
         ]
 
         if dummy_patients:
-            await PatientCollection.insert_many(dummy_patients)
+            for patient in dummy_patients:
+                set_search_fields(patient)
+            await PatientCollection.insert_many(dummy_patients, ordered=False)
             logger.info(f"Inserted {len(dummy_patients)} patients.")
 
         # --- Set up Counters ---
@@ -100,4 +111,26 @@ async def init_dummy_data():
 
     except Exception as e:
         logger.error(f"An unexpected error occurred during dummy data initialization: {e}", exc_info=True)
-        raise e
\ No newline at end of file
+        raise e
+
+
+async def backfill_search_fields():
+    """
+    One-off migration that sets the normalized search fields on patients stored
+    without them. Run it once with backfill_search_fields.py at the repo root.
+    """
+    operations = []
+    cursor = PatientCollection.find(
+        {"phone_digits": {"$exists": False}},
+        {"_id": 1, "name": 1, "email": 1, "phone": 1}
+    )
+    async for patient in cursor:
+        # A missing phone still gets phone_digits (""), so no patient matches this query twice.
+        patient.setdefault("phone", "")
+        set_search_fields(patient)
+        fields = {field: patient[field] for field in SEARCH_FIELDS if field in patient}
+        operations.append(UpdateOne({"_id": patient["_id"]}, {"$set": fields}))
+
+    if operations:
+        await PatientCollection.bulk_write(operations, ordered=False)
+        logger.info(f"Backfilled search fields for {len(operations)} patients.")
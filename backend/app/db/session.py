@@ -1,13 +1,27 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
 
-# Create a client instance
-client = AsyncIOMotorClient(settings.MONGO_URL)
+# Create a single client instance; it owns the connection pool for the whole app
+client = AsyncIOMotorClient(
+    settings.MONGO_URL,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    compressors=settings.MONGO_COMPRESSORS,
+    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    retryReads=True,
+    retryWrites=True,
+    uuidRepresentation="standard",
+    tz_aware=False,
+    appname="doctor-log"
+)
 
 # Get the database from the client
 # The database name is read from the environment variables
 database = client[settings.DB_NAME]
 
+# Applied as maxTimeMS to queries whose cost depends on user input or data size.
+QUERY_TIMEOUT_MS = settings.MONGO_QUERY_TIMEOUT_MS
+
 # --- Collections ---
 UserCollection = database.get_collection("users")
 PatientCollection = database.get_collection("patients")
@@ -1,18 +1,15 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
 from datetime import datetime
-import uuid
+from app.core.ids import new_id
+from app.schemas.clinical_note import VisitType
 
 class ClinicalNote(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     patient_id: str
     user_id: str
     content: str
-    visit_type: Literal["regular", "follow-up", "emergency"] = "regular"
+    visit_type: VisitType = "regular"
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
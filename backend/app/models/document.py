@@ -1,18 +1,14 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime
-import uuid
+from app.core.ids import new_id
 
 class Document(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     patient_id: str
     user_id: str
     file_name: str
     storage_url: str  # URL from Google Cloud Storage
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,11 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 from datetime import datetime
-import uuid
-from bson import ObjectId
+from app.core.ids import new_id
 
-class Patient(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class PatientListItem(BaseModel):
+    """
+    A patient as returned by list queries, without the (potentially large) photo.
+    """
+    id: str = Field(default_factory=new_id)
     patient_id: str
     user_id: str
     name: str
@@ -15,14 +17,12 @@ class Patient(BaseModel):
     location: Optional[str] = ""
     initial_complaint: Optional[str] = ""
     initial_diagnosis: Optional[str] = ""
-    photo: Optional[str] = ""
     group: Optional[str] = "general"
     is_favorite: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            ObjectId: str
-        }
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class Patient(PatientListItem):
+    photo: Optional[str] = ""
\ No newline at end of file
@@ -1,13 +1,18 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from typing import Optional
 from datetime import datetime, timedelta
-import uuid
-from bson import ObjectId
+from app.core.ids import new_id
 from app.schemas.user import UserPlan, SubscriptionStatus
 from app.schemas.role import UserRole
 
+# Fields never included in API responses
+_USER_RESPONSE_EXCLUDE = frozenset({"password_hash"})
+
+# Length of the free trial granted to new accounts
+TRIAL_PERIOD = timedelta(days=90)
+
 class User(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     email: EmailStr
     phone: Optional[str] = ""
     full_name: str
@@ -15,23 +20,16 @@ class User(BaseModel):
     plan: UserPlan = UserPlan.BASIC
     role: UserRole = UserRole.DOCTOR
     subscription_status: SubscriptionStatus = SubscriptionStatus.TRIALING
-    subscription_end_date: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(days=90))
+    subscription_end_date: datetime = Field(default_factory=lambda: datetime.utcnow() + TRIAL_PERIOD)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     password_hash: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-        # Helper to convert MongoDB's `_id` to `id`
-        json_encoders = {
-            ObjectId: str
-        }
+    model_config = ConfigDict(from_attributes=True)
 
     def to_response(self):
         """
         Returns a dictionary representation of the user for API responses,
         excluding sensitive information like the password hash.
         """
-        user_dict = self.dict()
-        user_dict.pop("password_hash", None)
-        return user_dict
\ No newline at end of file
+        return self.model_dump(exclude=_USER_RESPONSE_EXCLUDE, mode="json")
\ No newline at end of file
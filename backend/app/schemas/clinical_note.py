@@ -1,13 +1,16 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime
 from typing import Optional, Literal
-import uuid
+
+# The single definition of allowed visit types, shared by schemas and models.
+VisitType = Literal["regular", "follow-up", "emergency"]
 
 class ClinicalNoteBase(BaseModel):
     content: str = Field(..., min_length=1, max_length=5000, description="The content of the clinical note.")
-    visit_type: Literal["regular", "follow-up", "emergency"] = "regular"
+    visit_type: VisitType = "regular"
 
-    @validator('content')
+    @field_validator('content')
+    @classmethod
     def content_must_not_be_empty(cls, v):
         if not v.strip():
             raise ValueError('Content must not be empty')
@@ -27,5 +30,4 @@ class ClinicalNote(ClinicalNoteBase):
     user_id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,7 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from typing import Optional
-import uuid
 
 class DocumentBase(BaseModel):
     file_name: str = Field(..., description="The name of the uploaded file.")
@@ -16,5 +15,4 @@ class Document(DocumentBase):
     user_id: str
     uploaded_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import List, Optional, Literal
-from datetime import datetime
-import uuid
+from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import List, Optional
 import re
 
+# Compiled once at import; used by the phone validators below.
+PHONE_NUMBER_PATTERN = re.compile(r'^\+?1?\d{9,15}$')
+
 # --- Patient Schemas ---
 class PatientBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
@@ -17,15 +18,17 @@ class PatientBase(BaseModel):
     group: Optional[str] = Field(default="general", max_length=50)
     is_favorite: bool = False
 
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_be_empty(cls, v):
         if not v.strip():
             raise ValueError('Name must not be empty')
         return v
 
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone_number(cls, v):
-        if v and not re.match(r'^\+?1?\d{9,15}$', v):
+        if v and not PHONE_NUMBER_PATTERN.match(v):
             raise ValueError('Invalid phone number format.')
         return v
 
@@ -44,31 +47,16 @@ class PatientUpdate(BaseModel):
     group: Optional[str] = Field(default=None, max_length=50)
     is_favorite: Optional[bool] = None
 
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_be_empty(cls, v):
         if v and not v.strip():
             raise ValueError('Name must not be empty')
         return v
 
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone_number(cls, v):
-        if v and not re.match(r'^\+?1?\d{9,15}$', v):
+        if v and not PHONE_NUMBER_PATTERN.match(v):
             raise ValueError('Invalid phone number format.')
         return v
-
-class PatientInDBBase(PatientBase):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    patient_id: str  # Auto-generated incremental ID like PAT001
-    user_id: str  # Associate with logged-in user
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        from_attributes = True
-
-class Patient(PatientInDBBase):
-    pass
-
-class NoteCreate(BaseModel):
-    content: str = Field(..., min_length=1, max_length=5000)
-    visit_type: Literal["regular", "follow-up", "emergency"] = "regular"
\ No newline at end of file
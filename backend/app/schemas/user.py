@@ -1,11 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
-from datetime import datetime, timedelta
-import uuid
 import re
 from enum import Enum
 from .role import UserRole
 
+# Password complexity checks, compiled once at import.
+_LETTER_PATTERN = re.compile(r'[A-Za-z]')
+_DIGIT_PATTERN = re.compile(r'\d')
+
 class UserPlan(str, Enum):
     BASIC = "basic"
     PRO = "pro"
@@ -32,11 +34,12 @@ class UserCreate(UserBase):
         description="Password must be at least 8 characters long and contain at least one letter and one number."
     )
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def password_complexity(cls, v):
-        if not re.search(r'[A-Za-z]', v):
+        if not _LETTER_PATTERN.search(v):
             raise ValueError('Password must contain at least one letter')
-        if not re.search(r'\d', v):
+        if not _DIGIT_PATTERN.search(v):
             raise ValueError('Password must contain at least one number')
         return v
 
@@ -46,24 +49,6 @@ class UserUpdate(BaseModel):
     full_name: Optional[str] = Field(default=None, min_length=2, max_length=100)
     medical_specialty: Optional[str] = Field(default=None, max_length=100)
 
-class UserInDBBase(UserBase):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    plan: UserPlan = UserPlan.BASIC
-    role: UserRole = UserRole.PATIENT
-    subscription_status: SubscriptionStatus = SubscriptionStatus.TRIALING
-    subscription_end_date: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(days=90))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        from_attributes = True
-
-class User(UserInDBBase):
-    pass
-
-class UserInDB(UserInDBBase):
-    password_hash: str
-
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
\ No newline at end of file
@@ -1,8 +1,8 @@
-from async_lru import alru_cache
-from app.db.session import PatientCollection
+from app.core.cache import redis_memoize
+from app.db.session import PatientCollection, QUERY_TIMEOUT_MS
 from typing import List, Dict
 
-@alru_cache(maxsize=32)
+@redis_memoize(ttl=300, key=lambda user_id: f"analytics:growth:{user_id}")
 async def get_patient_growth_analytics(user_id: str) -> List[Dict]:
     """
     Generates patient growth analytics data for a specific user.
@@ -16,28 +16,24 @@ async def get_patient_growth_analytics(user_id: str) -> List[Dict]:
         },
         {
             "$group": {
-                "_id": {
-                    "year": {"$year": "$created_at"},
-                    "month": {"$month": "$created_at"}
-                },
+                # Patients created before `ym` existed fall back to formatting created_at.
+                "_id": {"$ifNull": ["$ym", {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}}]},
                 "count": {"$sum": 1}
             }
         },
         {
             "$sort": {
-                "_id.year": 1,
-                "_id.month": 1
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "year": "$_id.year",
-                "month": "$_id.month",
-                "count": "$count"
+                "_id": 1
             }
         }
     ]
 
-    growth_data = await PatientCollection.aggregate(pipeline).to_list(length=None)
-    return growth_data
\ No newline at end of file
+    growth_data = []
+    async for row in PatientCollection.aggregate(pipeline, maxTimeMS=QUERY_TIMEOUT_MS):
+        if row["_id"] is None:
+            # Patients without a created_at group under null, as they did with $year/$month.
+            growth_data.append({"year": None, "month": None, "count": row["count"]})
+            continue
+        year, month = row["_id"].split("-")
+        growth_data.append({"year": int(year), "month": int(month), "count": row["count"]})
+    return growth_data
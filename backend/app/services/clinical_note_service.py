@@ -1,5 +1,6 @@
-from app.db.session import ClinicalNoteCollection
+from app.db.session import ClinicalNoteCollection, QUERY_TIMEOUT_MS
 from app.models.clinical_note import ClinicalNote
+from app.core.hydrate import hydrate
 from app.schemas.clinical_note import ClinicalNoteCreate
 from typing import List
 
@@ -7,7 +8,8 @@ async def create_note(note_data: ClinicalNoteCreate, user_id: str) -> ClinicalNo
     """
     Creates a new clinical note for a patient.
     """
-    note = ClinicalNote(
+    # Built from validated input; only the id and created_at defaults are applied.
+    note = ClinicalNote.model_construct(
         patient_id=note_data.patient_id,
         user_id=user_id,
         content=note_data.content,
@@ -16,13 +18,18 @@ async def create_note(note_data: ClinicalNoteCreate, user_id: str) -> ClinicalNo
     await ClinicalNoteCollection.insert_one(note.model_dump())
     return note
 
-async def get_notes_for_patient(patient_id: str, user_id: str) -> List[ClinicalNote]:
+async def get_notes_for_patient(patient_id: str, user_id: str, limit: int = 0) -> List[ClinicalNote]:
     """
-    Retrieves all clinical notes for a specific patient that belong to the user.
+    Retrieves the clinical notes for a specific patient that belong to the user,
+    newest first. A positive `limit` returns only that many of the most recent notes.
     """
     notes_cursor = ClinicalNoteCollection.find({
         "patient_id": patient_id,
         "user_id": user_id
-    })
-    notes = await notes_cursor.to_list(length=None)
-    return [ClinicalNote(**note) for note in notes]
\ No newline at end of file
+    }, {"_id": 0}).sort("created_at", -1).limit(limit).max_time_ms(QUERY_TIMEOUT_MS)
+    # Build models as batches arrive instead of materializing the raw documents first.
+    notes = []
+    append = notes.append
+    async for note in notes_cursor:
+        append(hydrate(ClinicalNote, note))
+    return notes
\ No newline at end of file
@@ -1,7 +1,10 @@
 from app.db.session import DocumentCollection
 from app.models.document import Document
 from app.schemas.document import DocumentCreate
-from typing import List
+from typing import AsyncIterator, Dict
+
+# Only the fields of the Document model; skips Mongo's _id.
+_DOCUMENT_PROJECTION = {"_id": 0, **{field: 1 for field in Document.model_fields}}
 
 async def create_document(doc_data: DocumentCreate, user_id: str) -> Document:
     """
@@ -16,13 +19,14 @@ async def create_document(doc_data: DocumentCreate, user_id: str) -> Document:
     await DocumentCollection.insert_one(document.model_dump())
     return document
 
-async def get_documents_for_patient(patient_id: str, user_id: str) -> List[Document]:
+async def iter_documents_for_patient(patient_id: str, user_id: str) -> AsyncIterator[Dict]:
     """
-    Retrieves all documents for a specific patient that belong to the user.
+    Yields the documents for a specific patient that belong to the user,
+    one raw record at a time as the cursor fetches them.
     """
-    documents_cursor = DocumentCollection.find({
-        "patient_id": patient_id,
-        "user_id": user_id
-    })
-    documents = await documents_cursor.to_list(length=None)
-    return [Document(**doc) for doc in documents]
\ No newline at end of file
+    documents_cursor = DocumentCollection.find(
+        {"patient_id": patient_id, "user_id": user_id},
+        _DOCUMENT_PROJECTION
+    )
+    async for doc in documents_cursor:
+        yield doc
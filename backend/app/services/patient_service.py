@@ -1,123 +1,294 @@
-from async_lru import alru_cache
-from app.db.session import PatientCollection, CounterCollection
-from app.schemas.patient import PatientCreate, PatientUpdate, NoteCreate
-from app.schemas.clinical_note import ClinicalNoteCreate
-from app.models.patient import Patient
+import asyncio
+from pydantic import TypeAdapter
+from app.core.cache import redis_memoize
+from app.core.ids import new_id
+from app.core.hydrate import hydrate
+from app.db.session import PatientCollection, CounterCollection, QUERY_TIMEOUT_MS
+from app.schemas.patient import PatientCreate, PatientUpdate
+from app.schemas.clinical_note import ClinicalNoteCreate, NoteCreate
+from app.models.patient import Patient, PatientListItem
 from app.models.clinical_note import ClinicalNote
 from app.services import clinical_note_service, analytics_service
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from pymongo import ReturnDocument
+from cachetools import TTLCache
 from bson import ObjectId
-import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+import re
+import orjson
+
+_PATIENT_LIST = TypeAdapter(List[PatientListItem])
+# Normalized copies of searchable fields, written alongside them and never returned.
+SEARCH_FIELDS = ("name_lower", "email_lower", "phone_digits")
+# Server-side fields kept out of every response: the search copies and the creation month.
+INTERNAL_FIELDS = SEARCH_FIELDS + ("ym",)
+_NON_DIGITS = re.compile(r"\D")
+
+# Responses identify patients by `id`, so the ObjectId is never fetched. Notes live
+# in their own collection; older documents may still carry an embedded copy.
+_PATIENT_PROJECTION = {"_id": 0, "notes": 0, **{field: 0 for field in INTERNAL_FIELDS}}
+# List queries also leave out the base64 photo; it is only returned for single patients.
+_LIST_PROJECTION = {**_PATIENT_PROJECTION, "photo": 0}
+PATIENT_PAGE_SIZE = 50
+# Upper bound on patients accepted by one bulk create request.
+PATIENT_BULK_MAX = 100
+
+# --- Patient ID Reservation ---
+# IDs are reserved from the counter in small blocks so most creates need no round-trip.
+# Unused IDs in a block are skipped when the process restarts or the block expires,
+# and with several workers each holds its own block, so IDs stay unique but are not
+# contiguous (e.g. PAT001, PAT011, PAT002).
+PATIENT_ID_BLOCK_SIZE = 10
+# Only recently active users keep a block, so memory stays bounded. Dropping a
+# lock early is safe: the counter $inc is atomic, so IDs remain unique.
+_patient_id_blocks: TTLCache = TTLCache(maxsize=10_000, ttl=600)  # user_id -> (next, last)
+_patient_id_locks: TTLCache = TTLCache(maxsize=10_000, ttl=600)
 
 async def get_next_patient_id(user_id: str) -> str:
     """
     Generates the next patient ID for a given user.
     """
-    counter = await CounterCollection.find_one_and_update(
-        {"_id": f"patient_id_{user_id}"},
-        {"$inc": {"sequence": 1}},
-        upsert=True,
-        return_document=True
-    )
-    return f"PAT{counter['sequence']:03d}"
+    lock = _patient_id_locks.get(user_id)
+    if lock is None:
+        lock = _patient_id_locks[user_id] = asyncio.Lock()
+    async with lock:
+        next_sequence, last_sequence = _patient_id_blocks.get(user_id, (1, 0))
+        if next_sequence > last_sequence:
+            counter = await CounterCollection.find_one_and_update(
+                {"_id": f"patient_id_{user_id}"},
+                {"$inc": {"sequence": PATIENT_ID_BLOCK_SIZE}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            last_sequence = counter["sequence"]
+            next_sequence = last_sequence - PATIENT_ID_BLOCK_SIZE + 1
+        _patient_id_blocks[user_id] = (next_sequence + 1, last_sequence)
+    return f"PAT{next_sequence:03d}"
+
+async def _new_patient_document(patient_data: PatientCreate, user_id: str, now: datetime) -> Dict:
+    """
+    Builds the database document for a new patient, reserving its patient ID.
+    """
+    patient_dict = patient_data.model_dump()
+    patient_dict["id"] = new_id()
+    patient_dict["patient_id"] = await get_next_patient_id(user_id)
+    patient_dict["user_id"] = user_id
+    patient_dict["created_at"] = patient_dict["updated_at"] = now
+    # Creation month, precomputed for the growth analytics grouping.
+    patient_dict["ym"] = now.strftime("%Y-%m")
+    return set_search_fields(patient_dict)
+
+async def _invalidate_patient_caches(user_id: str):
+    # Lists, groups and stats all share the patient tag.
+    await get_patients_by_user_id.invalidate_tag(user_id)
+    await analytics_service.get_patient_growth_analytics.invalidate(user_id)
 
 async def create_patient(patient_data: PatientCreate, user_id: str) -> Patient:
     """
     Creates a new patient for a user.
     """
-    patient_id = await get_next_patient_id(user_id)
-    patient_dict = patient_data.dict()
-    patient_dict["id"] = str(uuid.uuid4())
-    patient_dict["patient_id"] = patient_id
-    patient_dict["user_id"] = user_id
-    patient_dict["created_at"] = datetime.utcnow()
-    patient_dict["updated_at"] = datetime.utcnow()
+    patient_dict = await _new_patient_document(patient_data, user_id, datetime.utcnow())
 
     await PatientCollection.insert_one(patient_dict)
+    await _invalidate_patient_caches(user_id)
 
-    # Invalidate caches
-    get_patients_by_user_id.cache_clear()
-    get_patient_groups.cache_clear()
-    get_user_stats.cache_clear()
-    analytics_service.get_patient_growth_analytics.cache_clear()
+    return Patient.model_construct(**patient_dict)
+
+async def create_patients(patients_data: List[PatientCreate], user_id: str) -> List[Patient]:
+    """
+    Creates several patients for a user with a single insert.
+    """
+    # MongoDB stores milliseconds, so each row is 1 ms after the previous one. This keeps
+    # the batch in request order in lists instead of tied on a single timestamp.
+    now = datetime.utcnow()
+    patient_dicts = [
+        await _new_patient_document(patient_data, user_id, now + timedelta(milliseconds=offset))
+        for offset, patient_data in enumerate(patients_data)
+    ]
 
+    try:
+        await PatientCollection.insert_many(patient_dicts, ordered=False)
+    finally:
+        # An unordered insert can fail after writing some rows, so always drop the cached reads.
+        await _invalidate_patient_caches(user_id)
 
-    return Patient(**patient_dict)
+    return [Patient.model_construct(**patient_dict) for patient_dict in patient_dicts]
 
-async def get_patient_by_id(patient_id: str, user_id: str) -> Optional[Patient]:
+def set_search_fields(patient: Dict) -> Dict:
+    """
+    Sets the normalized shadow fields used by prefix searches on a patient document.
+    Only fields present in the document are touched, so partial updates work too.
+    """
+    if patient.get("name"):
+        patient["name_lower"] = patient["name"].lower()
+    if "email" in patient:
+        patient["email_lower"] = (patient["email"] or "").lower()
+    if "phone" in patient:
+        patient["phone_digits"] = _NON_DIGITS.sub("", patient["phone"] or "")
+    return patient
+
+async def get_patient_by_id(
+    patient_id: str,
+    user_id: str,
+    include_photo: bool = True
+) -> Optional[PatientListItem]:
     """
     Retrieves a single patient by their ID and user ID.
+    With `include_photo=False` the photo is not fetched and a PatientListItem is returned.
     """
-    patient = await PatientCollection.find_one({"id": patient_id, "user_id": user_id})
-    if patient:
-        return Patient(**patient)
-    return None
+    if include_photo:
+        patient = await PatientCollection.find_one({"id": patient_id, "user_id": user_id}, _PATIENT_PROJECTION)
+        return Patient.model_construct(**patient) if patient else None
+    patient = await PatientCollection.find_one({"id": patient_id, "user_id": user_id}, _LIST_PROJECTION)
+    return PatientListItem.model_construct(**patient) if patient else None
 
 def _build_patient_query(
     user_id: str,
     search: Optional[str] = None,
     group: Optional[str] = None,
-    favorites_only: bool = False
+    favorites_only: bool = False,
+    text_search: bool = True
 ) -> Dict:
     """
     Builds the MongoDB query for fetching patients based on filters.
+    Searches use the patient text index, or a case-insensitive prefix match
+    when `text_search` is False.
     """
     query = {"user_id": user_id}
     if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"patient_id": {"$regex": search, "$options": "i"}},
-            {"phone": {"$regex": search, "$options": "i"}},
-            {"email": {"$regex": search, "$options": "i"}}
-        ]
+        if text_search:
+            query["$text"] = {"$search": search}
+        else:
+            # Anchored, case-sensitive patterns on normalized fields become index
+            # range scans. Patient IDs are always upper case.
+            lowered = re.escape(search.lower())
+            query["$or"] = [
+                {"name_lower": {"$regex": f"^{lowered}"}},
+                {"email_lower": {"$regex": f"^{lowered}"}},
+                {"patient_id": {"$regex": f"^{re.escape(search.upper())}"}}
+            ]
+            digits = _NON_DIGITS.sub("", search)
+            if digits:
+                query["$or"].append({"phone_digits": {"$regex": f"^{digits}"}})
     if group:
         query["group"] = group
     if favorites_only:
         query["is_favorite"] = True
     return query
 
+# --- List Cursors ---
+# A page ends at a (created_at, id) pair. Patients created in one batch share a
+# created_at, so the id breaks ties and no row is skipped between pages.
+_CURSOR_SEPARATOR = "|"
+
+def encode_patient_cursor(patient: PatientListItem) -> str:
+    """
+    Returns the cursor that continues a list after the given patient.
+    """
+    return f"{patient.created_at.isoformat()}{_CURSOR_SEPARATOR}{patient.id}"
+
+def decode_patient_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Parses a cursor from encode_patient_cursor. Raises ValueError if it is malformed.
+    """
+    created_at, separator, patient_id = cursor.partition(_CURSOR_SEPARATOR)
+    if not separator or not patient_id:
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(created_at), patient_id
 
-@alru_cache(maxsize=128)
+def _patient_cache_tag(user_id: str, *args, **kwargs) -> str:
+    # Every cached read of a user's patients shares one tag, so a write drops them all.
+    return f"pat:{user_id}"
+
+def _patient_list_key(
+    user_id: str,
+    search: Optional[str] = None,
+    group: Optional[str] = None,
+    favorites_only: bool = False,
+    limit: int = PATIENT_PAGE_SIZE,
+    before: Optional[Tuple[datetime, str]] = None
+) -> str:
+    # Filters are JSON-encoded so values containing ":" cannot collide.
+    return f"pat:{user_id}:" + orjson.dumps([search, group, favorites_only, limit, before]).decode()
+
+@redis_memoize(
+    ttl=60,
+    key=_patient_list_key,
+    tag=_patient_cache_tag,
+    dumps=_PATIENT_LIST.dump_json,
+    loads=_PATIENT_LIST.validate_json
+)
 async def get_patients_by_user_id(
     user_id: str,
     search: Optional[str] = None,
     group: Optional[str] = None,
-    favorites_only: bool = False
-) -> List[Patient]:
+    favorites_only: bool = False,
+    limit: int = PATIENT_PAGE_SIZE,
+    before: Optional[Tuple[datetime, str]] = None
+) -> List[PatientListItem]:
     """
-    Retrieves a list of patients for a user, with optional filters.
+    Retrieves one page of patients for a user, newest first, with optional filters.
+    Pass the decoded cursor of the last patient on a page as `before` to get the next one.
+    Searches return the `limit` best matches and ignore `before`.
+    Photos are not included.
     """
     query = _build_patient_query(user_id, search, group, favorites_only)
-    patients_cursor = PatientCollection.find(query).sort("created_at", -1)
-    patients = await patients_cursor.to_list(1000)
-    return [Patient(**p) for p in patients]
+    if before and not search:
+        created_at, patient_id = before
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": patient_id}}
+        ]
+    patients = await _find_patient_list(query, limit, by_relevance=bool(search))
+    if search and not patients:
+        # Text search only matches whole words; fall back to a prefix match for partial input.
+        query = _build_patient_query(user_id, search, group, favorites_only, text_search=False)
+        patients = await _find_patient_list(query, limit)
+    return patients
+
+async def _find_patient_list(query: Dict, limit: int, by_relevance: bool = False) -> List[PatientListItem]:
+    if by_relevance:
+        # Best text matches first, newest first among equal scores.
+        projection = {**_LIST_PROJECTION, "score": {"$meta": "textScore"}}
+        sort = [("score", {"$meta": "textScore"}), ("created_at", -1)]
+    else:
+        projection = _LIST_PROJECTION
+        sort = [("created_at", -1), ("id", -1)]
+    cursor = PatientCollection.find(query, projection).sort(sort).limit(limit).max_time_ms(QUERY_TIMEOUT_MS)
+    # Documents were validated on write, so skip re-validation on the way out.
+    patients = []
+    append = patients.append
+    async for patient in cursor:
+        append(hydrate(PatientListItem, patient))
+    return patients
 
 async def update_patient(patient_id: str, patient_data: PatientUpdate, user_id: str) -> Optional[Patient]:
     """
     Updates a patient's information.
     """
-    update_data = {k: v for k, v in patient_data.dict().items() if v is not None}
+    # Only fields the client actually sent; explicit nulls are ignored as before.
+    update_data = patient_data.model_dump(exclude_unset=True, exclude_none=True)
     if not update_data:
         # No fields to update, return the original patient
         return await get_patient_by_id(patient_id, user_id)
 
     update_data["updated_at"] = datetime.utcnow()
+    set_search_fields(update_data)
 
-    result = await PatientCollection.update_one(
+    updated = await PatientCollection.find_one_and_update(
         {"id": patient_id, "user_id": user_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection=_PATIENT_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
 
-    if result.matched_count == 0:
+    if updated is None:
         return None
 
     # Invalidate caches
-    get_patients_by_user_id.cache_clear()
-    get_patient_groups.cache_clear()
-    get_user_stats.cache_clear()
+    await get_patients_by_user_id.invalidate_tag(user_id)
 
-    return await get_patient_by_id(patient_id, user_id)
+    return Patient.model_construct(**updated)
 
 async def delete_patient(patient_id: str, user_id: str) -> bool:
     """
@@ -126,12 +297,7 @@ async def delete_patient(patient_id: str, user_id: str) -> bool:
     result = await PatientCollection.delete_one({"id": patient_id, "user_id": user_id})
 
     if result.deleted_count > 0:
-        # Invalidate caches
-        get_patients_by_user_id.cache_clear()
-        get_patient_groups.cache_clear()
-        get_user_stats.cache_clear()
-        analytics_service.get_patient_growth_analytics.cache_clear()
-
+        await _invalidate_patient_caches(user_id)
 
     return result.deleted_count > 0
 
@@ -141,64 +307,71 @@ async def add_note_to_patient(patient_id: str, note_data: NoteCreate, user_id: s
     clinical_notes collection.
     """
     # First, verify the patient exists and belongs to the user.
-    patient = await get_patient_by_id(patient_id, user_id)
-    if not patient:
+    if not await PatientCollection.find_one({"id": patient_id, "user_id": user_id}, {"_id": 1}):
         return None
 
-    # Create the clinical note using the dedicated service.
-    clinical_note_data = ClinicalNoteCreate(
+    # Create the clinical note using the dedicated service. The request body was
+    # already validated as a NoteCreate, so it is not validated again here.
+    clinical_note_data = ClinicalNoteCreate.model_construct(
         patient_id=patient_id,
         content=note_data.content,
         visit_type=note_data.visit_type
     )
     note = await clinical_note_service.create_note(clinical_note_data, user_id)
 
-    # Update the patient's updated_at timestamp.
+    # Update the patient's updated_at timestamp to match the note.
     await PatientCollection.update_one(
         {"id": patient_id, "user_id": user_id},
-        {"$set": {"updated_at": datetime.utcnow()}}
+        {"$set": {"updated_at": note.created_at}}
     )
 
     return note
 
-async def get_patient_notes(patient_id: str, user_id: str) -> Optional[List[ClinicalNote]]:
+async def get_patient_notes(patient_id: str, user_id: str, limit: int = 0) -> Optional[List[ClinicalNote]]:
     """
-    Retrieves all notes for a specific patient from the clinical_notes collection.
+    Retrieves the notes for a specific patient from the clinical_notes collection,
+    newest first. A positive `limit` returns only that many of the most recent notes.
     """
     # First, verify the patient exists and belongs to the user.
-    patient = await get_patient_by_id(patient_id, user_id)
-    if not patient:
+    # Only the existence matters, so skip fetching the (possibly large) document.
+    if not await PatientCollection.find_one({"id": patient_id, "user_id": user_id}, {"_id": 1}):
         return None
 
-    # Retrieve notes using the dedicated service.
-    notes = await clinical_note_service.get_notes_for_patient(patient_id, user_id)
+    # Retrieve notes using the dedicated service; they come back sorted by the database.
+    return await clinical_note_service.get_notes_for_patient(patient_id, user_id, limit)
 
-    # Sort notes by creation date descending
-    sorted_notes = sorted(notes, key=lambda n: n.created_at, reverse=True)
-    return sorted_notes
-
-@alru_cache(maxsize=32)
+@redis_memoize(ttl=60, key=lambda user_id: f"pat:{user_id}:groups", tag=_patient_cache_tag)
 async def get_patient_groups(user_id: str) -> List[str]:
     """
     Retrieves all unique patient groups for a user.
     """
-    groups = await PatientCollection.distinct("group", {"user_id": user_id})
+    groups = await PatientCollection.distinct("group", {"user_id": user_id}, maxTimeMS=QUERY_TIMEOUT_MS)
     return [group for group in groups if group]
 
-@alru_cache(maxsize=32)
+@redis_memoize(ttl=60, key=lambda user_id: f"pat:{user_id}:stats", tag=_patient_cache_tag)
 async def get_user_stats(user_id: str) -> Dict[str, any]:
     """
     Retrieves statistics for a user.
     """
-    total_patients = await PatientCollection.count_documents({"user_id": user_id})
-    favorite_patients = await PatientCollection.count_documents({"user_id": user_id, "is_favorite": True})
-
+    # One round-trip: every statistic is computed from the same scan.
     pipeline = [
-        {"$match": {"user_id": user_id, "group": {"$ne": None}}},
-        {"$group": {"_id": "$group", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}}
+        {"$match": {"user_id": user_id}},
+        {"$project": {"_id": 0, "is_favorite": 1, "group": 1}},
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "favorites": [{"$match": {"is_favorite": True}}, {"$count": "n"}],
+            "groups": [
+                {"$match": {"group": {"$ne": None}}},
+                {"$group": {"_id": "$group", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 100}
+            ]
+        }}
     ]
-    group_stats = await PatientCollection.aggregate(pipeline).to_list(100)
+    facets = (await PatientCollection.aggregate(pipeline, maxTimeMS=QUERY_TIMEOUT_MS).to_list(1))[0]
+    total_patients = facets["total"][0]["n"] if facets["total"] else 0
+    favorite_patients = facets["favorites"][0]["n"] if facets["favorites"] else 0
+    group_stats = facets["groups"]
 
     return {
         "total_patients": total_patients,
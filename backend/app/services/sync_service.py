@@ -1,7 +1,13 @@
+import asyncio
 from datetime import datetime
 from typing import Dict, Any, List
 from app.db.session import PatientCollection, ClinicalNoteCollection
 from app.models.user import User
+from app.services import patient_service, analytics_service
+from pymongo import UpdateOne, DeleteMany
+
+# Clients identify records by their `id`; the ObjectId and server-side internal fields stay in the database.
+_SYNC_PROJECTION = {"_id": 0, **{field: 0 for field in patient_service.INTERNAL_FIELDS}}
 
 async def pull_changes(last_pulled_at: int, user_id: str) -> Dict[str, Any]:
     """
@@ -9,9 +15,11 @@ async def pull_changes(last_pulled_at: int, user_id: str) -> Dict[str, Any]:
     """
     last_pulled_at_dt = datetime.fromtimestamp(last_pulled_at / 1000)
 
-    # Fetch changes from all relevant collections
-    patient_changes = await get_collection_changes(PatientCollection, last_pulled_at_dt, user_id)
-    note_changes = await get_collection_changes(ClinicalNoteCollection, last_pulled_at_dt, user_id)
+    # Fetch changes from all relevant collections concurrently
+    patient_changes, note_changes = await asyncio.gather(
+        get_collection_changes(PatientCollection, last_pulled_at_dt, user_id),
+        get_collection_changes(ClinicalNoteCollection, last_pulled_at_dt, user_id),
+    )
 
     changes = {
         "patients": patient_changes,
@@ -30,22 +38,24 @@ async def get_collection_changes(collection, last_pulled_at_dt: datetime, user_i
     created_cursor = collection.find({
         "user_id": user_id,
         "created_at": {"$gt": last_pulled_at_dt}
-    })
+    }, _SYNC_PROJECTION)
     updated_cursor = collection.find({
         "user_id": user_id,
         "updated_at": {"$gt": last_pulled_at_dt},
         "created_at": {"$lte": last_pulled_at_dt}
-    })
+    }, _SYNC_PROJECTION)
 
-    created = await created_cursor.to_list(length=None)
-    updated = await updated_cursor.to_list(length=None)
+    created, updated = await asyncio.gather(
+        created_cursor.to_list(length=None),
+        updated_cursor.to_list(length=None),
+    )
 
     # We don't have a way to track deletions yet.
     # This will be handled in a future iteration.
 
     return {
-        "created": [doc for doc in created],
-        "updated": [doc for doc in updated],
+        "created": created,
+        "updated": updated,
         "deleted": []
     }
 
@@ -53,29 +63,43 @@ async def push_changes(changes: Dict[str, Any], user_id: str):
     """
     Push changes from the client to the database.
     """
-    # Process changes for each table
+    # Process changes for each table concurrently
+    writes = []
     if "patients" in changes:
-        await process_collection_changes(PatientCollection, changes["patients"], user_id)
-
+        for doc in changes["patients"].get("created", []):
+            # New records always carry phone_digits, even without a phone.
+            doc.setdefault("phone", "")
+            patient_service.set_search_fields(doc)
+        for doc in changes["patients"].get("updated", []):
+            patient_service.set_search_fields(doc)
+        writes.append(process_collection_changes(PatientCollection, changes["patients"], user_id))
     if "clinical_notes" in changes:
-        await process_collection_changes(ClinicalNoteCollection, changes["clinical_notes"], user_id)
+        writes.append(process_collection_changes(ClinicalNoteCollection, changes["clinical_notes"], user_id))
+    await asyncio.gather(*writes)
+
+    if "patients" in changes:
+        await patient_service.get_patients_by_user_id.invalidate_tag(user_id)
+        await analytics_service.get_patient_growth_analytics.invalidate(user_id)
 
 async def process_collection_changes(collection, collection_changes: Dict[str, List[Dict]], user_id: str):
     """
-    Generic function to process creates, updates, and deletes for a collection.
+    Generic function to process creates, updates, and deletes for a collection
+    in a single unordered bulk write.
     """
-    if "created" in collection_changes:
-        for doc in collection_changes["created"]:
-            doc["user_id"] = user_id
-            await collection.insert_one(doc)
-
-    if "updated" in collection_changes:
-        for doc in collection_changes["updated"]:
-            await collection.update_one(
-                {"id": doc["id"], "user_id": user_id},
-                {"$set": doc}
-            )
-
-    if "deleted" in collection_changes:
-        for doc_id in collection_changes["deleted"]:
-            await collection.delete_one({"id": doc_id, "user_id": user_id})
\ No newline at end of file
+    operations = []
+
+    # Creates are upserts so a client retrying a push does not fail on existing ids.
+    for doc in collection_changes.get("created", []):
+        doc["user_id"] = user_id
+        operations.append(UpdateOne({"id": doc["id"], "user_id": user_id}, {"$set": doc}, upsert=True))
+
+    for doc in collection_changes.get("updated", []):
+        doc["user_id"] = user_id
+        operations.append(UpdateOne({"id": doc["id"], "user_id": user_id}, {"$set": doc}))
+
+    deleted_ids = collection_changes.get("deleted", [])
+    if deleted_ids:
+        operations.append(DeleteMany({"id": {"$in": deleted_ids}, "user_id": user_id}))
+
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
@@ -1,12 +1,23 @@
 from app.db.session import UserCollection
 from app.schemas.user import UserCreate, UserLogin, UserPlan, SubscriptionStatus
-from app.core.hashing import get_password_hash, verify_password
-from app.models.user import User
+from app.core.hashing import get_password_hash_async, verify_password_async, password_needs_rehash
+from app.models.user import User, TRIAL_PERIOD
+from app.schemas.role import UserRole
 from bson import ObjectId
-from typing import Optional
-import uuid
+from typing import Optional, Dict
 from datetime import datetime, timedelta
 
+def _user_from_db(user_from_db: Dict) -> User:
+    """
+    Builds a User from a trusted database document without re-running validation.
+    Enum fields are restored from their stored string values.
+    """
+    user = User.model_construct(**user_from_db)
+    user.plan = UserPlan(user.plan)
+    user.role = UserRole(user.role)
+    user.subscription_status = SubscriptionStatus(user.subscription_status)
+    return user
+
 async def create_user(user_data: UserCreate) -> User:
     """
     Creates a new user in the database.
@@ -15,16 +26,20 @@ async def create_user(user_data: UserCreate) -> User:
     if existing_user:
         raise ValueError("Email already registered")
 
-    user_dict = user_data.dict()
-    user_dict["password_hash"] = get_password_hash(user_dict.pop("password"))
+    user_dict = user_data.model_dump()
+    user_dict["password_hash"] = await get_password_hash_async(user_dict.pop("password"))
 
-    # Create a User model instance for the database.
-    # Pydantic will apply the default values for id, plan, subscription_status,
-    # subscription_end_date, created_at, and updated_at from the User model.
-    db_user = User(**user_dict)
+    # All timestamps share a single clock reading.
+    now = datetime.utcnow()
+    user_dict["created_at"] = user_dict["updated_at"] = now
+    user_dict["subscription_end_date"] = now + TRIAL_PERIOD
+
+    # Create a User model instance for the database. The input was validated as
+    # UserCreate, so only the defaults for id and subscription_status are applied.
+    db_user = User.model_construct(**user_dict)
 
     # Insert the dictionary representation into the database
-    await UserCollection.insert_one(db_user.dict())
+    await UserCollection.insert_one(db_user.model_dump())
 
     return db_user
 
@@ -33,10 +48,18 @@ async def authenticate_user(user_data: UserLogin) -> Optional[User]:
     Authenticates a user. Returns the user object if successful, otherwise None.
     """
     user_from_db = await UserCollection.find_one({"email": user_data.email})
-    if not user_from_db or not verify_password(user_data.password, user_from_db.get("password_hash", "")):
+    if not user_from_db:
+        return None
+    if not await verify_password_async(user_data.password, user_from_db.get("password_hash", "")):
         return None
 
-    return User(**user_from_db)
+    if password_needs_rehash(user_from_db["password_hash"]):
+        # Upgrade legacy hashes transparently while we have the plain password.
+        new_hash = await get_password_hash_async(user_data.password)
+        await UserCollection.update_one({"id": user_from_db["id"]}, {"$set": {"password_hash": new_hash}})
+        user_from_db["password_hash"] = new_hash
+
+    return _user_from_db(user_from_db)
 
 async def get_user_by_id(user_id: str) -> User | None:
     """
@@ -44,16 +67,27 @@ async def get_user_by_id(user_id: str) -> User | None:
     """
     user_from_db = await UserCollection.find_one({"id": user_id})
     if user_from_db:
-        return User(**user_from_db)
+        return _user_from_db(user_from_db)
     return None
 
+async def get_user_token_claims(user_id: str) -> Dict | None:
+    """
+    Retrieves only the fields embedded in access tokens (plan and role) for a user.
+    """
+    claims = await UserCollection.find_one({"id": user_id}, {"_id": 0, "plan": 1, "role": 1})
+    if claims is not None:
+        # Mirror the User model defaults for documents written before these fields existed.
+        claims.setdefault("plan", UserPlan.BASIC.value)
+        claims.setdefault("role", UserRole.DOCTOR.value)
+    return claims
+
 async def get_user_by_email(email: str) -> User | None:
     """
     Retrieves a user by their email.
     """
     user_from_db = await UserCollection.find_one({"email": email})
     if user_from_db:
-        return User(**user_from_db)
+        return _user_from_db(user_from_db)
     return None
 
 async def update_user(user_id: str, updates: dict) -> Optional[User]:
@@ -70,5 +104,5 @@ async def update_user(user_id: str, updates: dict) -> Optional[User]:
     )
 
     if result:
-        return User(**result)
+        return _user_from_db(result)
     return None
\ No newline at end of file
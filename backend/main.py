@@ -1,14 +1,19 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 import logging
 
 from app import api
 from app.core.config import settings
 from app.db.session import shutdown_db_client
+from app.core.kdf_pool import shutdown_pool
+from app.core.cache import close_cache
 from app.db.init_db import init_dummy_data
 from app.db.indexing import create_indexes
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from pymongo.errors import PyMongoError
 from starlette.requests import Request
 from app.core.limiter import limiter
 
@@ -16,20 +21,55 @@ from app.core.limiter import limiter
 app = FastAPI(
     title="Medical Contacts API",
     version="3.0",
-    description="Refactored API for managing medical contacts with advanced features."
+    description="Refactored API for managing medical contacts with advanced features.",
+    default_response_class=ORJSONResponse
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+@app.exception_handler(PyMongoError)
+async def database_exception_handler(request: Request, exc: PyMongoError):
+    """
+    Turns database failures that reach the top of a request into a generic 500,
+    or a 504 when the query ran out of its time budget.
+    """
+    if exc.timeout:
+        logging.warning(f"Database timeout during {request.method} {request.url.path}: {exc}")
+        return ORJSONResponse(
+            status_code=504,
+            content={"detail": "The database took too long to respond."}
+        )
+    logging.error(f"Database error during {request.method} {request.url.path}: {exc}", exc_info=exc)
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "An unexpected database error occurred."}
+    )
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """
+    Gives unexpected errors the same JSON shape as every other API error.
+    The server still logs the exception with its traceback.
+    """
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "An unexpected error occurred."}
+    )
+
 # --- Middleware ---
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Credentials cannot be combined with a wildcard origin, which forces the
+    # middleware to echo each request's origin; only allow them for a fixed list.
+    allow_credentials="*" not in settings.ALLOWED_ORIGINS,
+    allow_methods=settings.ALLOWED_METHODS,
+    allow_headers=settings.ALLOWED_HEADERS,
 )
 
+# Compress larger JSON bodies such as patient and note lists for clients that accept gzip.
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 # --- API Routers ---
 app.include_router(api.auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(api.patients.router, prefix="/api/patients", tags=["Patients"])
@@ -56,10 +96,16 @@ async def on_shutdown():
     """
     Actions to perform on application shutdown.
     - Close database connections gracefully.
+    - Stop the password hashing worker processes.
+    - Close the cache backend.
     """
     logging.info("Application shutting down...")
     await shutdown_db_client()
     logging.info("Database connections closed.")
+    shutdown_pool()
+    logging.info("Password hashing workers stopped.")
+    await close_cache()
+    logging.info("Cache connections closed.")
 
 # --- Root Endpoint ---
 @app.get("/api")
@@ -5,23 +5,93 @@ Tests all authentication, subscription, and patient management endpoints
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import sys
+import statistics
+from collections import defaultdict
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from datetime import datetime
 import os
 
+# orjson encodes and parses request/response bodies much faster; fall back to the stdlib.
+try:
+    import orjson
+    dumps, loads = orjson.dumps, orjson.loads
+except ImportError:
+    def dumps(obj):
+        return json.dumps(obj).encode()
+    loads = json.loads
+
 # Get backend URL from environment
 BACKEND_URL = os.getenv('EXPO_PUBLIC_BACKEND_URL', 'http://localhost:8000')
 API_BASE = f"{BACKEND_URL}/api"
 
+# Patients seeded for the demo user by init_db, in the order they are reported.
+DEMO_PATIENT_NAMES = ('John Wilson', 'Emma Rodriguez', 'Robert Chang', 'Lisa Thompson', 'David Miller')
+
+# Fixed request bodies, encoded once at import.
+DEMO_LOGIN_BODY = dumps({
+    "email": "dr.sarah@clinic.com",
+    "password": "password123"
+})
+TEST_PATIENT_BODY = dumps({
+    "name": "Test Patient Johnson",
+    "phone": "+1555999888",
+    "email": "test.patient@email.com",
+    "address": "123 Test Street, Test City",
+    "location": "Clinic Room 5",
+    "initial_complaint": "Test complaint for automated testing",
+    "initial_diagnosis": "Test diagnosis - automated test case",
+    "group": "test_group",
+    "is_favorite": True
+})
+PATIENT_UPDATE_BODY = dumps({
+    "initial_diagnosis": "Updated diagnosis - test completed successfully",
+    "is_favorite": False
+})
+PATIENT_NOTE_BODY = dumps({
+    "content": "Test note added during automated testing - patient responded well to treatment",
+    "visit_type": "follow-up"
+})
+BULK_PATIENT_COUNT = 3
+BULK_PATIENTS_BODY = dumps([
+    {"name": f"Bulk Patient {i}", "group": "test_group"} for i in range(1, BULK_PATIENT_COUNT + 1)
+])
+
 class MedicalContactsAPITester:
     def __init__(self):
         self.session = requests.Session()
+        # Keep a warm pool of connections to the single backend host, large enough
+        # for concurrent checks, and retry idempotent calls on gateway errors. Once the
+        # retries run out the last response is returned so tests can assert on its status.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Bodies are pre-encoded with dumps(), so declare the type once for every call.
+        self.session.headers["Content-Type"] = "application/json"
+        # Server response times per endpoint, reported as percentiles in the summary.
+        self.timings = defaultdict(list)
+        self.session.hooks["response"].append(self._record_timing)
         self.auth_token = None
+        self.auth_headers = None
         self.demo_user_token = None
+        self.demo_headers = None
         self.test_user_id = None
         self.test_patient_id = None
+        self.test_patient_url = None
         self.pro_user_token = None
+        self.pro_headers = None
+        # Tests in the same phase report from worker threads.
+        self._results_lock = threading.Lock()
         self.results = {
             'passed': 0,
             'failed': 0,
@@ -31,26 +101,62 @@ class MedicalContactsAPITester:
     def log_result(self, test_name, success, message="", response=None):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name}")
+        lines = [f"{status}: {test_name}"]
         if message:
-            print(f"   {message}")
+            lines.append(f"   {message}")
         if not success and response:
-            print(f"   Response: {response.status_code} - {response.text[:200]}")
+            lines.append(f"   Response: {response.status_code} - {response.text[:200]}")
         
-        if success:
-            self.results['passed'] += 1
-        else:
-            self.results['failed'] += 1
-            self.results['errors'].append(f"{test_name}: {message}")
-        print()
+        with self._results_lock:
+            if success:
+                self.results['passed'] += 1
+            else:
+                self.results['failed'] += 1
+                self.results['errors'].append(f"{test_name}: {message}")
+            # One write per result keeps its lines together and saves a flush per line.
+            print("\n".join(lines), end="\n\n")
+
+    def _record_timing(self, response, *args, **kwargs):
+        """Record how long the backend took to answer, keyed by method and path"""
+        path = urlsplit(response.request.url).path
+        if self.test_patient_id:
+            path = path.replace(self.test_patient_id, "{id}")
+        self.timings[f"{response.request.method} {path}"].append(response.elapsed.total_seconds() * 1000)
+
+    def print_latency_summary(self):
+        """Print P50/P95/P99 response times in milliseconds for every endpoint called"""
+        print("LATENCY (ms)                                          n      P50      P95      P99")
+        for endpoint, values in sorted(self.timings.items()):
+            if len(values) > 1:
+                cuts = statistics.quantiles(values, n=100, method="inclusive")
+                p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+            else:
+                p50 = p95 = p99 = values[0]
+            print(f"   {endpoint[:48]:<48} {len(values):>4} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+
+    def warm_up(self):
+        """Open a pooled connection to the backend so DNS, TCP and TLS setup is not charged to the first test"""
+        try:
+            # Sent as a bare prepared request so the session hooks leave it out of the timings.
+            self.session.send(requests.Request("HEAD", BACKEND_URL).prepare(), timeout=5)
+        except requests.RequestException:
+            pass
+
+    def run_concurrently(self, *calls):
+        """Run independent request callables in parallel and return their responses in order"""
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(call) for call in calls]
+            return [future.result() for future in futures]
     
     def test_health_check(self):
         """Test API health check"""
         try:
             response = self.session.get(f"{API_BASE}/")
-            success = response.status_code == 200 and "Medical Contacts API" in response.text
+            # Response.text decodes the body on every access, so read it once.
+            body = response.text
+            success = response.status_code == 200 and "Medical Contacts API" in body
             self.log_result("Health Check", success, 
-                          f"Status: {response.status_code}, Response: {response.json()}" if success else "API not responding correctly",
+                          f"Status: {response.status_code}, Response: {body}" if success else "API not responding correctly",
                           response)
             return success
         except Exception as e:
@@ -61,7 +167,7 @@ class MedicalContactsAPITester:
         """Test user registration"""
         try:
             user_data = {
-                "email": f"test.doctor.{datetime.now().timestamp()}@clinic.com",
+                "email": f"test.doctor.{uuid.uuid4().hex}@clinic.com",
                 "password": "testpassword123",
                 "full_name": "Dr. Test Doctor",
                 "phone": "+1234567890",
@@ -69,13 +175,14 @@ class MedicalContactsAPITester:
                 "role": "doctor"
             }
             
-            response = self.session.post(f"{API_BASE}/auth/register", json=user_data)
+            response = self.session.post(f"{API_BASE}/auth/register", data=dumps(user_data))
             success = response.status_code == 201 # Expect 201 Created
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('access_token'):
                     self.auth_token = data['access_token']
+                    self.auth_headers = {"Authorization": f"Bearer {self.auth_token}"}
                     self.test_user_id = data['user']['id']
                     self.log_result("User Registration", True, 
                                   f"User created with ID: {self.test_user_id}, Token received")
@@ -94,19 +201,20 @@ class MedicalContactsAPITester:
         """Register a dedicated pro user for testing pro features"""
         try:
             pro_user_data = {
-                "email": f"pro.user.{datetime.now().timestamp()}@clinic.com",
+                "email": f"pro.user.{uuid.uuid4().hex}@clinic.com",
                 "password": "pro_password_123",
                 "full_name": "Dr. Pro",
                 "plan": "pro",
                 "role": "doctor"
             }
-            response = self.session.post(f"{API_BASE}/auth/register", json=pro_user_data)
+            response = self.session.post(f"{API_BASE}/auth/register", data=dumps(pro_user_data))
             success = response.status_code == 201
 
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('access_token'):
                     self.pro_user_token = data['access_token']
+                    self.pro_headers = {"Authorization": f"Bearer {self.pro_user_token}"}
                     self.log_result("Pro User Registration", True, "Dedicated pro user registered successfully.")
                 else:
                     success = False
@@ -122,18 +230,14 @@ class MedicalContactsAPITester:
     def test_demo_user_login(self):
         """Test login with demo user"""
         try:
-            login_data = {
-                "email": "dr.sarah@clinic.com",
-                "password": "password123"
-            }
-            
-            response = self.session.post(f"{API_BASE}/auth/login", json=login_data)
+            response = self.session.post(f"{API_BASE}/auth/login", data=DEMO_LOGIN_BODY)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('access_token'):
                     self.demo_user_token = data['access_token']
+                    self.demo_headers = {"Authorization": f"Bearer {self.demo_user_token}"}
                     self.log_result("Demo User Login", True, 
                                   f"Demo user logged in: {data['user']['full_name']}, Specialty: {data['user']['medical_specialty']}")
                 else:
@@ -154,12 +258,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            headers = self.auth_headers
             response = self.session.get(f"{API_BASE}/auth/me", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('user'):
                     user = data['user']
                     self.log_result("Get Current User", True, 
@@ -182,12 +286,12 @@ class MedicalContactsAPITester:
             return False
 
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            headers = self.auth_headers
             response = self.session.get(f"{API_BASE}/auth/me", headers=headers)
             success = response.status_code == 200
 
             if success:
-                data = response.json().get('user', {})
+                data = loads(response.content).get('user', {})
                 plan = data.get('plan')
                 status = data.get('subscription_status')
                 end_date_str = data.get('subscription_end_date')
@@ -245,9 +349,15 @@ class MedicalContactsAPITester:
             return False
 
         try:
+            # The trial and pro requests are independent, so they are sent together.
+            headers_trial = self.auth_headers
+            calls = [lambda: self.session.get(f"{API_BASE}/patients/pro-feature/", headers=headers_trial)]
+            if self.pro_user_token:
+                headers_pro = self.pro_headers
+                calls.append(lambda: self.session.get(f"{API_BASE}/patients/pro-feature/", headers=headers_pro))
+            response_trial, *response_pro = self.run_concurrently(*calls)
+
             # 1. Test that the trial user (the default registered user) gets a 403 Forbidden
-            headers_trial = {"Authorization": f"Bearer {self.auth_token}"}
-            response_trial = self.session.get(f"{API_BASE}/patients/pro-feature/", headers=headers_trial)
             success_trial = response_trial.status_code == 403
             self.log_result("Pro Feature Access (Trial User)", success_trial,
                           f"Trial user correctly blocked with status {response_trial.status_code}" if success_trial else f"Trial user should be blocked, but got {response_trial.status_code}",
@@ -258,8 +368,7 @@ class MedicalContactsAPITester:
                 self.log_result("Pro Feature Access (Pro User)", False, "No pro user token available for test")
                 return False
 
-            headers_pro = {"Authorization": f"Bearer {self.pro_user_token}"}
-            response_pro = self.session.get(f"{API_BASE}/patients/pro-feature/", headers=headers_pro)
+            response_pro = response_pro[0]
             success_pro = response_pro.status_code == 200
             self.log_result("Pro Feature Access (Pro User)", success_pro,
                           f"Pro user correctly allowed with status {response_pro.status_code}" if success_pro else f"Pro user should be blocked, but got {response_pro.status_code}",
@@ -279,13 +388,13 @@ class MedicalContactsAPITester:
 
         try:
             # 1. Test that the basic/trial user gets a 403 Forbidden
-            headers_trial = {"Authorization": f"Bearer {self.auth_token}"}
+            headers_trial = self.auth_headers
             doc_data = {
                 "patient_id": self.test_patient_id,
                 "file_name": "trial_user_test_doc.pdf",
                 "storage_url": "https://fake-storage.com/trial_user_test_doc.pdf"
             }
-            response_trial_post = self.session.post(f"{API_BASE}/documents/", headers=headers_trial, json=doc_data)
+            response_trial_post = self.session.post(f"{API_BASE}/documents/", headers=headers_trial, data=dumps(doc_data))
             success_trial = response_trial_post.status_code == 403
             self.log_result("Document Upload (Trial User)", success_trial,
                           f"Trial user correctly blocked with status {response_trial_post.status_code}" if success_trial else f"Trial user should be blocked, but got {response_trial_post.status_code}",
@@ -296,13 +405,13 @@ class MedicalContactsAPITester:
                 self.log_result("Document Upload (Pro User)", False, "No pro user token available for test")
                 return False
 
-            headers_pro = {"Authorization": f"Bearer {self.pro_user_token}"}
+            headers_pro = self.pro_headers
             pro_doc_data = {
                 "patient_id": self.test_patient_id, # Using the same patient for simplicity
                 "file_name": "pro_user_test_doc.pdf",
                 "storage_url": "https://fake-storage.com/pro_user_test_doc.pdf"
             }
-            response_pro_post = self.session.post(f"{API_BASE}/documents/", headers=headers_pro, json=pro_doc_data)
+            response_pro_post = self.session.post(f"{API_BASE}/documents/", headers=headers_pro, data=dumps(pro_doc_data))
             success_pro_post = response_pro_post.status_code == 201
             self.log_result("Document Upload (Pro User)", success_pro_post,
                           f"Pro user correctly allowed to upload with status {response_pro_post.status_code}" if success_pro_post else f"Pro user upload failed with status {response_pro_post.status_code}",
@@ -310,7 +419,7 @@ class MedicalContactsAPITester:
 
             # 4. Test that the pro user can retrieve the document
             response_pro_get = self.session.get(f"{API_BASE}/documents/{self.test_patient_id}", headers=headers_pro)
-            success_pro_get = response_pro_get.status_code == 200 and len(response_pro_get.json()) == 1
+            success_pro_get = response_pro_get.status_code == 200 and len(loads(response_pro_get.content)) == 1
             self.log_result("Get Documents (Pro User)", success_pro_get,
                           f"Pro user correctly retrieved documents with status {response_pro_get.status_code}" if success_pro_get else f"Pro user get documents failed with status {response_pro_get.status_code}",
                           response_pro_get)
@@ -329,9 +438,15 @@ class MedicalContactsAPITester:
             return False
 
         try:
+            # The trial and pro requests are independent, so they are sent together.
+            headers_trial = self.auth_headers
+            calls = [lambda: self.session.get(f"{API_BASE}/analytics/patient-growth", headers=headers_trial)]
+            if self.pro_user_token:
+                headers_pro = self.pro_headers
+                calls.append(lambda: self.session.get(f"{API_BASE}/analytics/patient-growth", headers=headers_pro))
+            response_trial, *response_pro = self.run_concurrently(*calls)
+
             # 1. Test that the basic/trial user gets a 403 Forbidden
-            headers_trial = {"Authorization": f"Bearer {self.auth_token}"}
-            response_trial = self.session.get(f"{API_BASE}/analytics/patient-growth", headers=headers_trial)
             success_trial = response_trial.status_code == 403
             self.log_result("Analytics Access (Trial User)", success_trial,
                           f"Trial user correctly blocked with status {response_trial.status_code}" if success_trial else f"Trial user should be blocked, but got {response_trial.status_code}",
@@ -342,8 +457,7 @@ class MedicalContactsAPITester:
                 self.log_result("Analytics Access (Pro User)", False, "No pro user token available for test")
                 return False
 
-            headers_pro = {"Authorization": f"Bearer {self.pro_user_token}"}
-            response_pro = self.session.get(f"{API_BASE}/analytics/patient-growth", headers=headers_pro)
+            response_pro = response_pro[0]
             success_pro = response_pro.status_code == 200
             self.log_result("Analytics Access (Pro User)", success_pro,
                           f"Pro user correctly allowed to access analytics with status {response_pro.status_code}" if success_pro else f"Pro user analytics access failed with status {response_pro.status_code}",
@@ -363,11 +477,12 @@ class MedicalContactsAPITester:
 
         try:
             # 1. Test that a basic user can create a checkout session
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            headers = self.auth_headers
             response_checkout = self.session.post(f"{API_BASE}/payments/create-checkout-session", headers=headers)
-            success_checkout = response_checkout.status_code == 200 and "checkout_url" in response_checkout.json()
+            checkout_url = loads(response_checkout.content).get("checkout_url") if response_checkout.status_code == 200 else None
+            success_checkout = checkout_url is not None
             self.log_result("Create Checkout Session", success_checkout,
-                          f"Checkout session created successfully with URL: {response_checkout.json().get('checkout_url')}" if success_checkout else "Failed to create checkout session",
+                          f"Checkout session created successfully with URL: {checkout_url}" if success_checkout else "Failed to create checkout session",
                           response_checkout)
 
             # 2. Test that the webhook can be called (simulated)
@@ -379,7 +494,7 @@ class MedicalContactsAPITester:
                     }
                 }
             }
-            response_webhook = self.session.post(f"{API_BASE}/payments/webhooks/stripe", json=webhook_payload)
+            response_webhook = self.session.post(f"{API_BASE}/payments/webhooks/stripe", data=dumps(webhook_payload))
             success_webhook = response_webhook.status_code == 200
             self.log_result("Stripe Webhook", success_webhook,
                           "Webhook endpoint responded successfully" if success_webhook else "Webhook endpoint failed",
@@ -393,19 +508,21 @@ class MedicalContactsAPITester:
     
     def save_results_to_file(self, filename="test_result.md"):
         """Save test results to a Markdown file"""
+        lines = [
+            "# API Test Results\n",
+            f"**Timestamp:** {datetime.now().isoformat()}",
+            f"**Backend URL:** {API_BASE}\n",
+            "## Summary",
+            f"- **✅ PASSED:** {self.results['passed']}",
+            f"- **❌ FAILED:** {self.results['failed']}",
+            f"- **📊 TOTAL:** {self.results['passed'] + self.results['failed']}\n",
+        ]
+        if self.results['failed'] > 0:
+            lines.append("## 🚨 Failed Tests")
+            lines.extend(f"- {error}" for error in self.results['errors'])
+        
         with open(filename, 'w') as f:
-            f.write("# API Test Results\n\n")
-            f.write(f"**Timestamp:** {datetime.now().isoformat()}\n")
-            f.write(f"**Backend URL:** {API_BASE}\n\n")
-            f.write("## Summary\n")
-            f.write(f"- **✅ PASSED:** {self.results['passed']}\n")
-            f.write(f"- **❌ FAILED:** {self.results['failed']}\n")
-            f.write(f"- **📊 TOTAL:** {self.results['passed'] + self.results['failed']}\n\n")
-            
-            if self.results['failed'] > 0:
-                f.write("## 🚨 Failed Tests\n")
-                for error in self.results['errors']:
-                    f.write(f"- {error}\n")
+            f.write("\n".join(lines) + "\n")
     
     def test_demo_patients_loaded(self):
         """Test that demo patients are loaded for demo user"""
@@ -414,20 +531,19 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.demo_user_token}"}
+            headers = self.demo_headers
             response = self.session.get(f"{API_BASE}/patients", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('patients'):
                     patients = data['patients']
                     patient_count = len(patients)
                     if patient_count >= 5:  # Should have 5 demo patients
                         # Check for specific demo patients
-                        patient_names = [p['name'] for p in patients]
-                        expected_names = ['John Wilson', 'Emma Rodriguez', 'Robert Chang', 'Lisa Thompson', 'David Miller']
-                        found_names = [name for name in expected_names if name in patient_names]
+                        patient_names = {p['name'] for p in patients}
+                        found_names = [name for name in DEMO_PATIENT_NAMES if name in patient_names]
                         
                         self.log_result("Demo Patients Loaded", True, 
                                       f"Found {patient_count} patients including: {', '.join(found_names[:3])}")
@@ -453,27 +569,16 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            patient_data = {
-                "name": "Test Patient Johnson",
-                "phone": "+1555999888",
-                "email": "test.patient@email.com",
-                "address": "123 Test Street, Test City",
-                "location": "Clinic Room 5",
-                "initial_complaint": "Test complaint for automated testing",
-                "initial_diagnosis": "Test diagnosis - automated test case",
-                "group": "test_group",
-                "is_favorite": True
-            }
-            
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = self.session.post(f"{API_BASE}/patients", json=patient_data, headers=headers)
+            headers = self.auth_headers
+            response = self.session.post(f"{API_BASE}/patients", data=TEST_PATIENT_BODY, headers=headers)
             success = response.status_code == 201 # Expect 201 Created
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('patient'):
                     patient = data['patient']
                     self.test_patient_id = patient['id']
+                    self.test_patient_url = f"{API_BASE}/patients/{self.test_patient_id}"
                     self.log_result("Create Patient", True, 
                                   f"Created patient: {patient['name']}, ID: {patient['patient_id']}")
                 else:
@@ -487,6 +592,32 @@ class MedicalContactsAPITester:
             self.log_result("Create Patient", False, f"Exception: {str(e)}")
             return False
     
+    def test_bulk_create_patients(self):
+        """Test creating several patients in one request"""
+        if not self.pro_user_token:
+            self.log_result("Bulk Create Patients", False, "No pro user token available")
+            return False
+        
+        try:
+            # Seeded on the pro user so the test user's single-patient checks are unaffected.
+            response = self.session.post(f"{API_BASE}/patients/bulk", data=BULK_PATIENTS_BODY, headers=self.pro_headers)
+            success = response.status_code == 201
+            
+            if success:
+                patients = loads(response.content).get('patients') or []
+                patient_ids = {patient['patient_id'] for patient in patients}
+                success = len(patients) == BULK_PATIENT_COUNT and len(patient_ids) == BULK_PATIENT_COUNT
+                self.log_result("Bulk Create Patients", success,
+                              f"Created {len(patients)} patients with {len(patient_ids)} distinct patient IDs",
+                              response)
+            else:
+                self.log_result("Bulk Create Patients", False, "Failed to bulk create patients", response)
+            
+            return success
+        except Exception as e:
+            self.log_result("Bulk Create Patients", False, f"Exception: {str(e)}")
+            return False
+    
     def test_get_patients(self):
         """Test getting patients list"""
         if not self.auth_token:
@@ -494,12 +625,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            headers = self.auth_headers
             response = self.session.get(f"{API_BASE}/patients", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and 'patients' in data:
                     patients = data['patients']
                     self.log_result("Get Patients", True, 
@@ -522,14 +653,14 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.demo_user_token}"}
+            headers = self.demo_headers
             
-            # Test search by name
-            response = self.session.get(f"{API_BASE}/patients?search=John", headers=headers)
+            # Test search by name. Results are ranked by relevance, so the top few rows are enough to check.
+            response = self.session.get(f"{API_BASE}/patients?search=John&limit=5", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('patients'):
                     patients = data['patients']
                     found_john = any('John' in p['name'] for p in patients)
@@ -557,18 +688,13 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            update_data = {
-                "initial_diagnosis": "Updated diagnosis - test completed successfully",
-                "is_favorite": False
-            }
-            
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = self.session.put(f"{API_BASE}/patients/{self.test_patient_id}", 
-                                      json=update_data, headers=headers)
+            headers = self.auth_headers
+            response = self.session.put(self.test_patient_url, 
+                                      data=PATIENT_UPDATE_BODY, headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('patient'):
                     patient = data['patient']
                     self.log_result("Update Patient", True, 
@@ -591,18 +717,13 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            note_data = {
-                "content": "Test note added during automated testing - patient responded well to treatment",
-                "visit_type": "follow-up"
-            }
-            
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = self.session.post(f"{API_BASE}/patients/{self.test_patient_id}/notes", 
-                                       json=note_data, headers=headers)
+            headers = self.auth_headers
+            response = self.session.post(f"{self.test_patient_url}/notes", 
+                                       data=PATIENT_NOTE_BODY, headers=headers)
             success = response.status_code == 201 # Expect 201 Created
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('note'):
                     note = data['note']
                     self.log_result("Add Patient Note", True, 
@@ -625,12 +746,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = self.session.get(f"{API_BASE}/patients/{self.test_patient_id}/notes", headers=headers)
+            headers = self.auth_headers
+            response = self.session.get(f"{self.test_patient_url}/notes", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and 'notes' in data:
                     notes = data['notes']
                     self.log_result("Get Patient Notes", True, 
@@ -653,12 +774,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.demo_user_token}"}
+            headers = self.demo_headers
             response = self.session.get(f"{API_BASE}/patients/groups/", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and 'groups' in data:
                     groups = data['groups']
                     if len(groups) > 0:
@@ -685,12 +806,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.demo_user_token}"}
+            headers = self.demo_headers
             response = self.session.get(f"{API_BASE}/patients/stats/", headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success') and data.get('stats'):
                     stats = data['stats']
                     if stats.get('total_patients', 0) > 0:
@@ -712,46 +833,29 @@ class MedicalContactsAPITester:
     
     def test_user_data_isolation(self):
         """Test that users can only see their own patients"""
-        if not self.auth_token or not self.demo_user_token:
-            self.log_result("User Data Isolation", False, "Missing auth tokens")
+        if not self.auth_token or not self.demo_user_token or not self.test_patient_id:
+            self.log_result("User Data Isolation", False, "Missing auth tokens or patient ID")
             return False
         
         try:
-            # Get patients for test user (should be 1 - the one we created)
-            headers1 = {"Authorization": f"Bearer {self.auth_token}"}
-            response1 = self.session.get(f"{API_BASE}/patients", headers=headers1)
-            
-            # Get patients for demo user (should be 5 demo patients)
-            headers2 = {"Authorization": f"Bearer {self.demo_user_token}"}
-            response2 = self.session.get(f"{API_BASE}/patients", headers=headers2)
-            
-            success = response1.status_code == 200 and response2.status_code == 200
-            
+            # Look up the test user's patient as its owner and as the demo user. Only the
+            # owner may see it; this checks isolation without downloading either patient list.
+            url = f"{self.test_patient_url}?include_photo=false"
+            response_owner, response_other = self.run_concurrently(
+                lambda: self.session.get(url, headers=self.auth_headers),
+                lambda: self.session.get(url, headers=self.demo_headers),
+            )
+            
+            success = response_owner.status_code == 200 and response_other.status_code == 404
             if success:
-                data1 = response1.json()
-                data2 = response2.json()
-                
-                if data1.get('success') and data2.get('success'):
-                    patients1 = data1['patients']
-                    patients2 = data2['patients']
-                    
-                    # Check that patient lists are different and don't overlap
-                    patient_ids1 = set(p['id'] for p in patients1)
-                    patient_ids2 = set(p['id'] for p in patients2)
-                    overlap = patient_ids1.intersection(patient_ids2)
-                    
-                    if len(overlap) == 0:
-                        self.log_result("User Data Isolation", True, 
-                                      f"Test user has {len(patients1)} patients, Demo user has {len(patients2)} patients, No overlap")
-                    else:
-                        success = False
-                        self.log_result("User Data Isolation", False, 
-                                      f"Found {len(overlap)} overlapping patients - data isolation failed")
-                else:
-                    success = False
-                    self.log_result("User Data Isolation", False, "Failed to get patient data for comparison")
+                self.log_result("User Data Isolation", True, 
+                              "Owner can read the test patient, Demo user gets 404")
+            elif response_owner.status_code != 200:
+                self.log_result("User Data Isolation", False, "Owner could not read the test patient", response_owner)
             else:
-                self.log_result("User Data Isolation", False, "Failed to retrieve patients for both users")
+                self.log_result("User Data Isolation", False, 
+                              f"Demo user got status {response_other.status_code} for another user's patient - data isolation failed",
+                              response_other)
             
             return success
         except Exception as e:
@@ -765,12 +869,12 @@ class MedicalContactsAPITester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = self.session.delete(f"{API_BASE}/patients/{self.test_patient_id}", headers=headers)
+            headers = self.auth_headers
+            response = self.session.delete(self.test_patient_url, headers=headers)
             success = response.status_code == 200
             
             if success:
-                data = response.json()
+                data = loads(response.content)
                 if data.get('success'):
                     self.log_result("Delete Patient", True, 
                                   f"Successfully deleted test patient: {data.get('message')}")
@@ -793,34 +897,49 @@ class MedicalContactsAPITester:
         print(f"Testing API at: {API_BASE}")
         print()
         
-        # Test sequence
-        tests = [
-            ("Health Check", self.test_health_check),
-            ("User Registration", self.test_user_registration),
-            ("Register Pro User", self.register_pro_user),
-            ("User Registration Details", self.test_user_registration_details),
-            ("Demo User Login", self.test_demo_user_login),
-            ("Get Current User", self.test_get_current_user),
-            ("Unauthorized Access Protection", self.test_unauthorized_access),
-            ("Pro Feature Access", self.test_pro_feature_access),
-            ("Demo Patients Loaded", self.test_demo_patients_loaded),
-            ("Create Patient", self.test_create_patient),
-            # ("Document Feature Access", self.test_document_feature_access), # Temporarily disabled due to pre-existing issue
-            ("Analytics Feature Access", self.test_analytics_feature_access),
-            ("Payment Flow", self.test_payment_flow),
-            ("Get Patients", self.test_get_patients),
-            ("Search Patients", self.test_search_patients),
-            ("Update Patient", self.test_update_patient),
-            ("Add Patient Note", self.test_add_patient_note),
-            ("Get Patient Notes", self.test_get_patient_notes),
-            ("Get Groups", self.test_get_groups),
-            ("Get Statistics", self.test_get_statistics),
-            ("User Data Isolation", self.test_user_data_isolation),
-            ("Delete Patient", self.test_delete_patient),
+        self.warm_up()
+        
+        # Test phases. Tests within a phase are independent and run concurrently;
+        # each phase only starts once the tokens and patient from earlier phases exist.
+        phases = [
+            [
+                ("Health Check", self.test_health_check),
+                ("User Registration", self.test_user_registration),
+                ("Register Pro User", self.register_pro_user),
+                ("Demo User Login", self.test_demo_user_login),
+                ("Unauthorized Access Protection", self.test_unauthorized_access),
+            ],
+            [
+                # Registration details and analytics expect the test user's trial plan, so they precede the payment flow.
+                ("User Registration Details", self.test_user_registration_details),
+                ("Get Current User", self.test_get_current_user),
+                ("Pro Feature Access", self.test_pro_feature_access),
+                ("Demo Patients Loaded", self.test_demo_patients_loaded),
+                ("Create Patient", self.test_create_patient),
+                ("Bulk Create Patients", self.test_bulk_create_patients),
+                ("Analytics Feature Access", self.test_analytics_feature_access),
+            ],
+            [
+                # ("Document Feature Access", self.test_document_feature_access), # Temporarily disabled due to pre-existing issue
+                ("Payment Flow", self.test_payment_flow),
+                ("Get Patients", self.test_get_patients),
+                ("Search Patients", self.test_search_patients),
+                ("Update Patient", self.test_update_patient),
+                ("Add Patient Note", self.test_add_patient_note),
+                ("Get Groups", self.test_get_groups),
+                ("Get Statistics", self.test_get_statistics),
+                ("User Data Isolation", self.test_user_data_isolation),
+            ],
+            [
+                ("Get Patient Notes", self.test_get_patient_notes),
+            ],
+            [
+                ("Delete Patient", self.test_delete_patient),
+            ],
         ]
         
-        for test_name, test_func in tests:
-            test_func()
+        for phase in phases:
+            self.run_concurrently(*(test_func for _, test_func in phase))
         
         # Summary
         print("=" * 80)
@@ -836,6 +955,8 @@ class MedicalContactsAPITester:
                 print(f"   • {error}")
         
         print("=" * 80)
+        self.print_latency_summary()
+        print("=" * 80)
         
         # Save results to file
         self.save_results_to_file()
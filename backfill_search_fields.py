@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import sys
+import os
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.insert(0, project_root)
+
+from app.db.init_db import backfill_search_fields
+from app.db.session import shutdown_db_client
+
+# Configure basic logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+async def main():
+    logging.info("Backfilling patient search fields...")
+    try:
+        await backfill_search_fields()
+        logging.info("Backfill finished successfully.")
+    except Exception as e:
+        logging.error(f"An error occurred during the backfill: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        await shutdown_db_client()
+        logging.info("Database connection closed.")
+
+if __name__ == "__main__":
+    # Run once after deploying the search-field change; new writes set the fields themselves.
+    asyncio.run(main())
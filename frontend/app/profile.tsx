@@ -425,7 +425,7 @@ export default function ProfileScreen() {
         )}
 
         {/* Preferences Section */}
-        <View style={styles.preferencesSection}>
+        <View style={styles.preferencesSection} testID="preferences-section">
           <Text style={styles.sectionTitle}>Preferences</Text>
           <View style={styles.preferenceItem}>
             <Ionicons name="pulse" size={24} color="#666" />
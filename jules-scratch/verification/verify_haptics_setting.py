@@ -1,9 +1,13 @@
+import os
 from playwright.sync_api import sync_playwright, expect
 
+PW_WS_ENDPOINT = os.environ.get("PW_WS_ENDPOINT")
+
 def run(playwright):
-    browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
+    # Reuse a warm remote browser when one is configured, otherwise start a local one.
+    browser = (playwright.chromium.connect(PW_WS_ENDPOINT)
+               if PW_WS_ENDPOINT else playwright.chromium.launch(headless=True))
+    page = browser.new_page()
 
     try:
         # Navigate to the login page
@@ -25,16 +29,13 @@ def run(playwright):
         expect(profile_button).to_be_visible()
         profile_button.click()
 
-        # Wait for the profile screen to load and find the preferences section
-        preferences_section_title = page.get_by_text("Preferences")
-        expect(preferences_section_title).to_be_visible(timeout=30000)
-
-        # Locate the parent section containing the title and the toggle
-        preferences_section = preferences_section_title.locator('xpath=./ancestor::*[contains(@style, "background-color: rgb(255, 255, 255)")]')
-        expect(preferences_section).to_be_visible()
+        # Wait for the profile screen to load and find the preferences section,
+        # which contains the section title and the toggle
+        preferences_section = page.get_by_test_id("preferences-section")
+        expect(preferences_section).to_be_visible(timeout=30000)
 
         # Take a screenshot of the preferences section
-        preferences_section.screenshot(path="jules-scratch/verification/verification.png")
+        preferences_section.screenshot(path="jules-scratch/verification/verification.png", animations="disabled", caret="hide")
 
         print("Screenshot of preferences section taken successfully.")
 
@@ -1,9 +1,13 @@
+import os
 from playwright.sync_api import sync_playwright, expect
 
+PW_WS_ENDPOINT = os.environ.get("PW_WS_ENDPOINT")
+
 def run(playwright):
-    browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
+    # Reuse a warm remote browser when one is configured, otherwise start a local one.
+    browser = (playwright.chromium.connect(PW_WS_ENDPOINT)
+               if PW_WS_ENDPOINT else playwright.chromium.launch(headless=True))
+    page = browser.new_page()
 
     try:
         # Navigate to the login page
@@ -20,7 +24,7 @@ def run(playwright):
         expect(page.get_by_role("button", name="sync")).to_be_visible()
 
         # Take a screenshot of the main page
-        page.screenshot(path="jules-scratch/verification/verification.png")
+        page.screenshot(path="jules-scratch/verification/verification.png", animations="disabled", caret="hide")
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,11 +1,15 @@
+import os
 from playwright.sync_api import sync_playwright
 
+PW_WS_ENDPOINT = os.environ.get("PW_WS_ENDPOINT")
+
 def run(playwright):
-    browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
+    # Reuse a warm remote browser when one is configured, otherwise start a local one.
+    browser = (playwright.chromium.connect(PW_WS_ENDPOINT)
+               if PW_WS_ENDPOINT else playwright.chromium.launch(headless=True))
+    page = browser.new_page()
     page.goto("http://localhost:8082")
-    page.screenshot(path="jules-scratch/verification/homepage_8082.png")
+    page.screenshot(path="jules-scratch/verification/homepage_8082.png", animations="disabled", caret="hide")
     browser.close()
 
 with sync_playwright() as playwright:
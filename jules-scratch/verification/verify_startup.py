@@ -1,13 +1,33 @@
-from playwright.sync_api import sync_playwright, expect
+import os
+import sys
+import urllib.request
+
+APP_URL = "http://localhost:8081"
+PW_WS_ENDPOINT = os.environ.get("PW_WS_ENDPOINT")
+# The loading screen, the login page and the main page each render one of these.
+STARTUP_MARKERS = ("Loading...", "Login", "Medical Contacts")
+
+def check_html():
+    # The web build is statically rendered, so the first screen's text is in the served HTML.
+    with urllib.request.urlopen(APP_URL, timeout=30) as response:
+        html = response.read().decode("utf-8", errors="replace")
+    if any(marker in html for marker in STARTUP_MARKERS):
+        print("App served its startup screen.")
+        return True
+    print(f"None of {STARTUP_MARKERS} found in the page: {html[:500]}")
+    return False
 
 def run(playwright):
-    browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
+    from playwright.sync_api import expect
+
+    # Reuse a warm remote browser when one is configured, otherwise start a local one.
+    browser = (playwright.chromium.connect(PW_WS_ENDPOINT)
+               if PW_WS_ENDPOINT else playwright.chromium.launch(headless=True))
+    page = browser.new_page()
 
     try:
         # Navigate to the app's URL
-        page.goto("http://localhost:8081", timeout=60000)
+        page.goto(APP_URL, timeout=60000)
 
         # Wait for either the loading indicator or the login page to appear
         # The login page has a prominent "Login" heading.
@@ -22,7 +42,7 @@ def run(playwright):
 
 
         # Take a screenshot
-        page.screenshot(path="jules-scratch/verification/verification.png")
+        page.screenshot(path="jules-scratch/verification/verification.png", animations="disabled", caret="hide")
         print("Screenshot taken successfully.")
 
     except Exception as e:
@@ -33,5 +53,10 @@ def run(playwright):
     finally:
         browser.close()
 
-with sync_playwright() as playwright:
-    run(playwright)
\ No newline at end of file
+# Pass --full to render the page in a browser and take a screenshot.
+if "--full" in sys.argv:
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as playwright:
+        run(playwright)
+else:
+    sys.exit(0 if check_html() else 1)
\ No newline at end of file